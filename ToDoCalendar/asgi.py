@@ -9,8 +9,22 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ToDoCalendar.settings')
 
+
+def close_connections_per_request():
+    """Close database connections at the end of each request.
+
+    The ASGI handler runs the database work of each request in a thread of
+    its own; a connection kept for the next request would stay open with
+    the finished thread, whatever server runs the application.
+    """
+    for database in settings.DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
+
+close_connections_per_request()
 application = get_asgi_application()
@@ -41,9 +41,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.forms',
     'corsheaders',
-    'pytest',
-    'drf_yasg',
     'rest_framework',
     'rest_framework_simplejwt',
     'api.apps.ApiConfig',
@@ -51,16 +50,36 @@ INSTALLED_APPS = [
     'django_password_validators.password_history',
 ]
 
+# Serve the swagger and redoc documentation of the API (see api.docs).
+# Without it the workers import neither drf_yasg nor the documentation.
+API_DOCS_ENABLED = (
+    os.getenv('API_DOCS_ENABLED') or 'true'
+).lower() in ('1', 'true', 'yes')
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.append('drf_yasg')
+
 MIDDLEWARE = [
+    'api.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.common.CommonMiddleware',
+    'api.middleware.NonAPIMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Run by api.middleware.NonAPIMiddleware for every request but those under
+# API_PATH_PREFIX, which are authenticated by their bearer token.
+NON_API_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+API_PATH_PREFIX = '/api/'
+
+# The admin checks look for its middleware in MIDDLEWARE only, it is in
+# NON_API_MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
 
 ROOT_URLCONF = 'ToDoCalendar.urls'
 
@@ -68,7 +87,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -76,27 +94,118 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates are compiled once even with DEBUG, as in Django
+            # 4.1: the admin renders a template per form widget (see
+            # FORM_RENDERER). runserver still reloads edited templates.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
+# Form widgets are rendered by the engine of TEMPLATES, with its cached
+# loader.
+FORM_RENDERER = 'django.forms.renderers.TemplatesSetting'
+
 WSGI_APPLICATION = 'ToDoCalendar.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# Connections are kept for POSTGRES_CONN_MAX_AGE seconds (0 closes them at
+# the end of each request, as always under ASGI, see ToDoCalendar/asgi.py)
+# and checked before their first use in a request unless
+# POSTGRES_CONN_HEALTH_CHECKS=false.
+# POSTGRES_POOL_MODE=transaction is for connecting through a pgbouncer in
+# transaction pooling mode: a transaction may run on any server connection,
+# so server-side cursors, which outlive transactions, are not used.
+
+POSTGRES_POOL_MODE = os.getenv('POSTGRES_POOL_MODE') or 'session'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'api.postgresql',
         'NAME': os.getenv('POSTGRES_DB') or 'todocalendar',
         'USER': os.getenv('POSTGRES_USER') or 'todocalendar',
         'PASSWORD': os.getenv('POSTGRES_PASSWORD') or '1234',
         'HOST': os.getenv('POSTGRES_HOST') or 'localhost',
         'PORT': os.getenv('POSTGRES_PORT') or '5432',
+        'CONN_MAX_AGE': int(os.getenv('POSTGRES_CONN_MAX_AGE') or 60),
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('POSTGRES_CONN_HEALTH_CHECKS') or 'true'
+        ).lower() in ('1', 'true', 'yes'),
+        'DISABLE_SERVER_SIDE_CURSORS': POSTGRES_POOL_MODE == 'transaction',
     }
 }
 
+# Read replicas, as a comma-separated list of host[:port][/name] in
+# POSTGRES_REPLICAS; the port and name default to those of the primary.
+# Task reads go to them as set up in api/routers.py, except for users who
+# wrote in the last POSTGRES_REPLICA_PIN_TIMEOUT seconds.
+
+DATABASE_REPLICAS = []
+
+for number, replica in enumerate(
+    filter(None, (os.getenv('POSTGRES_REPLICAS') or '').split(',')), 1
+):
+    address, _, name = replica.strip().partition('/')
+    host, _, port = address.partition(':')
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'NAME': name or DATABASES['default']['NAME'],
+        # Tests read the rows the test wrote.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_TIMEOUT = int(
+    os.getenv('POSTGRES_REPLICA_PIN_TIMEOUT') or 10
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Redis when REDIS_URL is set, the local-memory cache otherwise. The
+# local-memory cache is not shared by processes: manage.py serve refuses
+# to start several workers with it.
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Lifetime of cached task list and statuses responses (see api.cache)
+TASKS_CACHE_TIMEOUT = int(os.getenv('TASKS_CACHE_TIMEOUT') or 300)
+
+
+# Production server (manage.py serve, see api/management/commands/serve.py)
+# Workers default to a count derived from the CPUs.
+
+SERVER_INTERFACE = os.getenv('SERVER_INTERFACE') or 'wsgi'
+SERVER_BIND = os.getenv('SERVER_BIND') or '0.0.0.0:8000'
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS') or 0) or None
+SERVER_THREADS = int(os.getenv('SERVER_THREADS') or 0) or None
+# Requests after which a worker is replaced, 0 never replaces it
+SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS') or 10000)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -123,13 +232,102 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+# PASSWORD_HASHER (argon2, scrypt or pbkdf2) hashes new passwords, the
+# others only verify old hashes, which are rehashed on login (see
+# api.hashers).
+
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER') or 'argon2'
+
+_password_hashers = {
+    'argon2': 'api.hashers.Argon2PasswordHasher',
+    'scrypt': 'api.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'api.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    _password_hashers.pop(PASSWORD_HASHER),
+    *_password_hashers.values(),
+]
+
+# Argon2id costs, the OWASP recommended minimum by default
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST') or 2)
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.getenv('PASSWORD_ARGON2_MEMORY_COST') or 19456
+)
+PASSWORD_ARGON2_PARALLELISM = int(
+    os.getenv('PASSWORD_ARGON2_PARALLELISM') or 1
+)
+PASSWORD_SCRYPT_WORK_FACTOR = int(
+    os.getenv('PASSWORD_SCRYPT_WORK_FACTOR') or 2 ** 14
+)
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.getenv('PASSWORD_PBKDF2_ITERATIONS') or 320000
+)
+
+# Passwords hashed at once in each process
+PASSWORD_HASHING_CONCURRENCY = int(
+    os.getenv('PASSWORD_HASHING_CONCURRENCY') or os.cpu_count() or 1
+)
+
+
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'api.exception_handler.api_exception_handler',
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.LazyUserJWTAuthentication',
     ],
 }
 
+# Seconds clients may use the OpenAPI schema before revalidating it (see
+# api.schema)
+SCHEMA_CACHE_MAX_AGE = int(os.getenv('SCHEMA_CACHE_MAX_AGE') or 3600)
+
+# Seconds api.authentication keeps the is_active state of a user in
+# process (0 checks it on every request)
+JWT_USER_ACTIVE_CACHE_TIMEOUT = int(
+    os.getenv('JWT_USER_ACTIVE_CACHE_TIMEOUT') or 30
+)
+
+# Maximum number of verified tokens api.tokens keeps in process (0 turns
+# the cache off)
+JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE') or 10000)
+
+
+# Keyset pagination of GET /api/v1/tasks/ (see api.pagination)
+TASKS_PAGE_SIZE = int(os.getenv('TASKS_PAGE_SIZE') or 100)
+TASKS_MAX_PAGE_SIZE = int(os.getenv('TASKS_MAX_PAGE_SIZE') or 1000)
+
+# Maximum number of tasks in one POST /api/v1/tasks/bulk/ request
+TASKS_MAX_BULK_SIZE = int(os.getenv('TASKS_MAX_BULK_SIZE') or 1000)
+
+# Delta sync of GET /api/v1/tasks/changes/ (see api.sync): days tokens and
+# tombstones are kept
+TASKS_SYNC_RETENTION = int(os.getenv('TASKS_SYNC_RETENTION') or 30)
+
+# Monthly partitions of api_task by start date (see api/partitions.py):
+# migrate converts the table and creates the partitions of the next
+# TASKS_PARTITIONS_AHEAD months.
+TASKS_PARTITIONED = (
+    os.getenv('TASKS_PARTITIONED') or 'false'
+).lower() in ('1', 'true', 'yes')
+TASKS_PARTITIONS_AHEAD = int(os.getenv('TASKS_PARTITIONS_AHEAD') or 12)
+
+# Request timing (see api.middleware.RequestTimingMiddleware): share of
+# the requests (0 to 1) timed in detail and given a Server-Timing header,
+# and milliseconds above which a request is logged (0 turns it off)
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.getenv('REQUEST_TIMING_SAMPLE_RATE') or 0
+)
+REQUEST_TIMING_SLOW_MS = float(os.getenv('REQUEST_TIMING_SLOW_MS') or 1000)
+
+# Tasks the admin changelist counts exactly; above this planner estimate
+# it shows the estimate (see api.admin)
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv('ADMIN_EXACT_COUNT_LIMIT') or 10000)
+
+# Database work running at once in each process for the async task API
+# (see api.async_views)
+ASYNC_DB_CONCURRENCY = int(os.getenv('ASYNC_DB_CONCURRENCY') or 20)
+
 
 SIMPLE_JWT = {
     # 'JWT_ALLOW_REFRESH': True,
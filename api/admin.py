@@ -1,17 +1,108 @@
+import datetime
+import json
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db.models import Min
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cache import bump_generation
+from .models import Task, TaskQuerySet
+from .sync import record_deletions
+
+
+def get_periods(value, kind):
+    """Return the start of the year/month/day of ``value`` and of the next.
+
+    The periods are in the current time zone; the next one is None past
+    the last representable date.
+    """
+    day = timezone.localtime(value).date()
+    if kind == 'year':
+        start = day.replace(month=1, day=1)
+    elif kind == 'month':
+        start = day.replace(day=1)
+    else:
+        start = day
+    try:
+        if kind == 'year':
+            end = start.replace(year=start.year + 1)
+        elif kind == 'month':
+            end = (start + datetime.timedelta(days=32)).replace(day=1)
+        else:
+            end = start + datetime.timedelta(days=1)
+    except (OverflowError, ValueError):
+        end = None
+
+    def make_aware(date):
+        return timezone.make_aware(
+            datetime.datetime.combine(date, datetime.time())
+        )
+
+    return make_aware(start), end and make_aware(end)
+
+
+class ChangeListQuerySet(TaskQuerySet):
+    """Tasks of the changelist, with a ``datetimes()`` for millions of rows.
+
+    The date hierarchy of the admin lists the years (months, days) having
+    tasks with ``SELECT DISTINCT date_trunc(...)`` over every matching
+    row. Here each one is found with ``min(start_date)`` past the previous
+    one instead: an index probe per period with tasks.
+    """
 
-from .models import Task
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None,
+                  is_dst=timezone.NOT_PASSED):
+        queryset = self.order_by()
+        periods = []
+        value = queryset.aggregate(value=Min(field_name))['value']
+        while value is not None:
+            start, end = get_periods(value, kind)
+            periods.append(start)
+            if end is None:
+                break
+            value = queryset.filter(
+                **{f'{field_name}__gte': end}
+            ).aggregate(value=Min(field_name))['value']
+
+        if order == 'DESC':
+            periods.reverse()
+        return periods
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting the tasks of large changelists approximately.
+
+    When the query planner estimates more than ``ADMIN_EXACT_COUNT_LIMIT``
+    rows, its estimate is the count: a ``COUNT(*)`` would read them all.
+    """
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.is_empty():
+            return 0
+        # The estimate of ordered queries may be off (Gather Merge).
+        plan = json.loads(
+            self.object_list.order_by().explain(format='json')
+        )
+        estimate = plan[0]['Plan']['Plan Rows']
+        if estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+            return int(estimate)
+        return super().count
 
 
 class TaskAdmin(admin.ModelAdmin):
-    list_editable = (
-        'title',
-        'description',
-        'start_date',
-        'end_date',
-        'completed',
-        'user',
-    )
+    """Tasks admin, fit for tables of millions of tasks.
+
+    Every query of the changelist is served by an index: the ordering,
+    the date hierarchy and the filters by the (start_date, id) one,
+    searches by the primary key and the user indexes. Counts are
+    estimated, there is no count of the unfiltered tasks, and filters
+    only offer a bounded number of choices.
+    """
     list_display = (
         'id',
         'title',
@@ -21,18 +112,69 @@ class TaskAdmin(admin.ModelAdmin):
         'completed',
         'user',
     )
-    list_filter = ('title', 'description', 'user', 'completed')
-    search_fields = (
-        'id',
-        'title',
-        'description',
-        'start_date',
-        'end_date',
-        'completed',
-        'user__username',
-        'user__id',
-    )
+    list_editable = ('completed',)
+    list_select_related = ('user',)
+    list_filter = ('completed',)
+    date_hierarchy = 'start_date'
+    ordering = ('-start_date', '-id')
+    sortable_by = ('id', 'start_date')
+    search_fields = ('=id', '=user__username', '=user__email')
+    search_help_text = 'Task id, or username or email of its user.'
+    autocomplete_fields = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-void-'
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return ChangeListQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset.db
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        """Look the term up as it is in the fields of ``search_fields``.
+
+        The admin would look for every word with ``UPPER()`` comparisons
+        which none of the indexes serve.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            if int(search_term) >= 2 ** 63:
+                return queryset.none(), False
+            return queryset.filter(pk=search_term), False
+        if '@' in search_term:
+            # Served by the auth_user_email_lower_uniq index, which
+            # leaves blank emails out.
+            return queryset.alias(email=Lower('user__email')).filter(
+                email=search_term.lower()
+            ).exclude(user__email=''), False
+        return queryset.filter(user__username=search_term), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        bump_generation(obj.user_id)
+        if change and 'user' in form.changed_data:
+            # For its previous owner the task is gone.
+            record_deletions(form.initial['user'], [obj.pk])
+            bump_generation(form.initial['user'])
+
+    def delete_model(self, request, obj):
+        record_deletions(obj.user_id, [obj.pk])
+        super().delete_model(request, obj)
+        bump_generation(obj.user_id)
+
+    def delete_queryset(self, request, queryset):
+        deleted = {}
+        for pk, user_id in queryset.values_list('id', 'user_id'):
+            deleted.setdefault(user_id, []).append(pk)
+
+        for user_id, task_ids in deleted.items():
+            record_deletions(user_id, task_ids)
+        super().delete_queryset(request, queryset)
+        for user_id in deleted:
+            bump_generation(user_id)
+
 
 admin.site.register(Task, TaskAdmin)
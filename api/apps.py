@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
+
+
+def partition_tasks(sender, using, **kwargs):
+    """Partition the task table and roll its partitions forward."""
+    from .partitions import create_partitions, partition_table
+
+    if settings.TASKS_PARTITIONED and using == 'default':
+        partition_table()
+        create_partitions()
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        post_migrate.connect(partition_tasks, sender=self)
@@ -0,0 +1,178 @@
+"""Async versions of the task endpoints, for ASGI servers.
+
+    GET, POST /api/v1/async/tasks/
+    GET       /api/v1/async/tasks/{id}/
+    GET       /api/v1/async/tasks/statuses/
+
+Requests and responses are the ones of the matching TaskViewSet
+actions. Django 4.0 has no async ORM yet, so the database work of a
+request runs in a thread through ``sync_to_async``, at most
+``ASYNC_DB_CONCURRENCY`` of them at a time per process: slow clients and
+requests waiting for the database hold no worker, and one process
+multiplexes many of them. A request holds a database connection from its
+first query to its end; under ASGI connections are not kept for the next
+request (see ToDoCalendar/asgi.py).
+"""
+import asyncio
+import weakref
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import MethodNotAllowed, NotAuthenticated
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import LazyUserJWTAuthentication
+from .cache import bump_generation
+from .exception_handler import api_exception_handler
+from .filters import filter_by_date_window, filter_by_start_date
+from .models import Task
+from .pagination import TaskCursorPagination
+from .routers import replica_reads
+from .serializers import (
+    TaskSerializer,
+    TaskStatusesSerializer,
+    TaskValuesSerializer,
+)
+from .timing import timed
+
+
+# event loop -> semaphore bounding the database work running on it
+_db_semaphores = weakref.WeakKeyDictionary()
+
+
+async def run_db(func, *args):
+    """Run ``func`` doing database work in a thread and await it."""
+    loop = asyncio.get_running_loop()
+    semaphore = _db_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+        _db_semaphores[loop] = semaphore
+
+    async with semaphore:
+        return await sync_to_async(func)(*args)
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    with timed('render'):
+        content = JSONRenderer().render(data)
+    return HttpResponse(
+        content,
+        content_type='application/json',
+        status=status_code,
+        headers=headers,
+    )
+
+
+def handle_exception(exc):
+    """Render an exception the way DRF and api_exception_handler do."""
+    response = api_exception_handler(exc, {})
+    if response is None:
+        raise exc
+
+    headers = {}
+    if response.status_code == status.HTTP_401_UNAUTHORIZED:
+        headers['WWW-Authenticate'] = (
+            LazyUserJWTAuthentication().authenticate_header(None)
+        )
+    return render(response.data, response.status_code, headers)
+
+
+def authenticate(request):
+    result = LazyUserJWTAuthentication().authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0].pk
+
+
+def task_api_view(methods):
+    """Make an async view ``view(request, user_id, ...)`` an API view.
+
+    The request is authenticated like TaskViewSet requests and errors are
+    rendered like theirs.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+
+                user_id = await run_db(authenticate, request)
+                return await view(request, user_id, *args, **kwargs)
+            except Exception as exc:
+                return handle_exception(exc)
+
+        # Bearer tokens are not sent by browsers on their own, like with
+        # DRF views. csrf_exempt does not support async views in Django 4.0.
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def list_tasks(request, user_id):
+    queryset = filter_by_start_date(
+        Task.objects.filter(user_id=user_id), request.GET
+    )
+    queryset = queryset.values(*TaskValuesSerializer.fields)
+
+    with replica_reads(user_id):
+        paginator = TaskCursorPagination()
+        page = paginator.paginate_queryset(queryset, Request(request))
+        if page is not None:
+            data = TaskValuesSerializer(page).data
+            return paginator.get_paginated_response(data).data
+
+        return TaskValuesSerializer(queryset.order_by('start_date', 'id')).data
+
+
+def create_task(data, user_id):
+    serializer = TaskSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save(user_id=user_id)
+    bump_generation(user_id)
+    return serializer.data
+
+
+def retrieve_task(user_id, pk):
+    try:
+        with replica_reads(user_id):
+            task = Task.objects.get(user_id=user_id, pk=pk)
+    except Task.DoesNotExist:
+        raise Http404
+    return TaskSerializer(task).data
+
+
+def get_statuses(request, user_id):
+    queryset = filter_by_date_window(
+        Task.objects.filter(user_id=user_id), request.GET
+    )
+    with replica_reads(user_id):
+        return TaskStatusesSerializer(queryset.statuses(), many=True).data
+
+
+@task_api_view(['GET', 'POST'])
+async def task_list(request, user_id):
+    if request.method == 'POST':
+        data = Request(
+            request, parsers=[JSONParser(), FormParser(), MultiPartParser()]
+        ).data
+        data = await run_db(create_task, data, user_id)
+        return render(data, status.HTTP_201_CREATED)
+
+    return render(await run_db(list_tasks, request, user_id))
+
+
+@task_api_view(['GET'])
+async def task_detail(request, user_id, pk):
+    return render(await run_db(retrieve_task, user_id, pk))
+
+
+@task_api_view(['GET'])
+async def task_statuses(request, user_id):
+    return render(await run_db(get_statuses, request, user_id))
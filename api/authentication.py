@@ -0,0 +1,118 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import get_verified_token
+
+
+User = get_user_model()
+
+# user id -> (is_active, monotonic time the entry expires at)
+_active_users = {}
+_active_users_max_size = 10000
+
+
+def clear_active_users():
+    _active_users.clear()
+
+
+def is_user_active(user_id):
+    """Return whether the user exists and is active, or None if missing.
+
+    Answers are kept in process for ``JWT_USER_ACTIVE_CACHE_TIMEOUT``
+    seconds, so deactivating a user takes at most that long to apply.
+    """
+    timeout = settings.JWT_USER_ACTIVE_CACHE_TIMEOUT
+    now = time.monotonic()
+
+    entry = _active_users.get(user_id)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    is_active = User.objects.filter(pk=user_id).values_list(
+        'is_active', flat=True
+    ).first()
+    if timeout:
+        if len(_active_users) >= _active_users_max_size:
+            _active_users.clear()
+        _active_users[user_id] = (is_active, now + timeout)
+    return is_active
+
+
+class LazyUser(SimpleLazyObject):
+    """User loaded from the database on first access to its attributes.
+
+    The primary key is known from the token, so ``pk``, ``id`` and the
+    authentication flags do not need the query.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.__dict__['_user_id'] = user_id
+        super().__init__(lambda: User.objects.get(pk=user_id))
+
+    def __bool__(self):
+        return True
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+    id = pk
+
+
+class LazyUserJWTAuthentication(JWTAuthentication):
+    """JWT authentication returning a ``LazyUser`` built from the token.
+
+    Task endpoints only need the user id, so authenticating a request
+    costs at most a cached ``is_active`` check instead of a full user
+    SELECT. Verified tokens are cached as well (see api.tokens).
+    """
+
+    def get_validated_token(self, raw_token):
+        messages = []
+        for AuthToken in api_settings.AUTH_TOKEN_CLASSES:
+            try:
+                return get_verified_token(AuthToken, raw_token)
+            except TokenError as e:
+                messages.append({
+                    'token_class': AuthToken.__name__,
+                    'token_type': AuthToken.token_type,
+                    'message': e.args[0],
+                })
+
+        raise InvalidToken({
+            'detail': _('Given token not valid for any token type'),
+            'messages': messages,
+        })
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        is_active = is_user_active(user_id)
+        if is_active is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if not is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+
+        return LazyUser(user_id)
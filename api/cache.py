@@ -0,0 +1,135 @@
+"""Per-user cache and validators of task responses.
+
+Cached responses are keyed by the user's generation, a value replaced on
+every write to the user's tasks. Invalidation is therefore one cache
+write, and entries of older generations are never read again and simply
+expire.
+
+The generation also validates conditional requests: the ETag and
+Last-Modified of a response are derived from it, so a ``304 Not
+Modified`` is answered without touching the database.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_generation_key(user_id):
+    return f'tasks:{user_id}:generation'
+
+
+def get_generation(user_id):
+    return cache.get_or_set(get_generation_key(user_id), time.time_ns, None)
+
+
+def bump_generation(user_id):
+    """Invalidate every cached task response of the user.
+
+    Inside a transaction the generation is bumped again on commit,
+    so a response built from the pre-commit snapshot in the meantime
+    cannot stay cached.
+    """
+    def bump():
+        cache.set(get_generation_key(user_id), time.time_ns(), None)
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def get_params_hash(query_params):
+    params = sorted(
+        (key, sorted(values)) for key, values in query_params.lists()
+    )
+    return hashlib.md5(repr(params).encode()).hexdigest()
+
+
+def get_cache_key(user_id, action, query_params):
+    generation = get_generation(user_id)
+    params = get_params_hash(query_params)
+    return f'tasks:{user_id}:{generation}:{action}:{params}'
+
+
+def get_etag(generation, request, action, kwargs):
+    """Return the strong ETag of a task response.
+
+    It identifies the generation, the action and its arguments, and the
+    media type, since every representation needs its own strong ETag.
+    """
+    etag = ':'.join([
+        str(generation),
+        action,
+        repr(sorted(kwargs.items())),
+        get_params_hash(request.query_params),
+        request.accepted_media_type or '',
+    ])
+    return quote_etag(hashlib.md5(etag.encode()).hexdigest())
+
+
+def cache_per_user(view_method):
+    """Cache successful responses of a TaskViewSet action per user.
+
+    Streamed responses are never buffered, so they bypass the cache.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if self.is_streaming(request):
+            return view_method(self, request, *args, **kwargs)
+
+        key = get_cache_key(request.user.pk, self.action, request.query_params)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view_method(self, request, *args, **kwargs)
+        if (isinstance(response, Response)
+                and response.status_code == status.HTTP_200_OK):
+            cache.set(key, response.data, settings.TASKS_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
+
+
+def condition_per_user(view_method):
+    """Answer conditional GETs of a TaskViewSet action per user.
+
+    Successful responses get an ETag and Last-Modified computed from the
+    user's generation, and requests whose ``If-None-Match`` or
+    ``If-Modified-Since`` still match get ``304 Not Modified``.
+
+    Last-Modified has a one-second resolution, so ETags are the exact
+    validator.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        generation = get_generation(request.user.pk)
+        etag = get_etag(generation, request, self.action, kwargs)
+        last_modified = generation // 10 ** 9
+
+        def set_headers(response):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return set_headers(response)
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_headers(response)
+        return response
+
+    return wrapper
@@ -0,0 +1,816 @@
+"""Swagger and redoc documentation of the API.
+
+The ``swagger_auto_schema`` arguments of the views, with their examples,
+and the schema URLs. The workers import neither this module nor drf_yasg
+when ``API_DOCS_ENABLED`` is off (see api.swagger): ROOT_URLCONF only
+includes it when it is on.
+"""
+from django.urls import path, re_path
+from drf_yasg import openapi
+from rest_framework import permissions
+from rest_framework_simplejwt import serializers
+
+from .schema import get_schema_view
+from .serializers import (
+    RegisterSerializer,
+    TaskCompleteSerializer,
+    TaskSerializer,
+    TaskStatusesSerializer,
+)
+
+
+example_task = {
+    'id': 1,
+    'title': 'string',
+    'description': 'string',
+    'start_date': '2022-06-05T10:15:00Z',
+    'end_date': '2022-06-05T10:20:00Z',
+    'completed': True,
+    'user': 1,
+}
+
+open_api_400_required_title = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'title': 'This field is required.',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_required_start_date = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'start_date': 'This field is required.',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_required_end_date = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'end_date': 'This field is required.',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_title = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'title': 'This field may not be blank.',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_start_date = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'start_date': 'Datetime has wrong format. Use one of these formats instead: YYYY-MM-DDThh:mm[:ss[.uuuuuu]][+HH:MM|-HH:MM|Z].',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_end_date = openapi.Response(
+    description='Bad Request',
+    examples={
+        'application/json': {
+            'end_date': 'Datetime has wrong format. Use one of these formats instead: YYYY-MM-DDThh:mm[:ss[.uuuuuu]][+HH:MM|-HH:MM|Z].',
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_username = openapi.Response(
+    description='Bad request',
+    examples={
+        'application/json': {
+            'username': 'This field may not be blank.',
+        },
+    },
+    schema=serializers.TokenObtainPairSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_email = openapi.Response(
+    description='Bad request',
+    examples={
+        'application/json': {
+            'username': 'This field may not be blank.',
+        },
+    },
+    schema=serializers.TokenObtainPairSerializer,  # Тут нужно поменять
+)
+
+open_api_400_blank_password = openapi.Response(
+    description='Bad request',
+    examples={
+        'application/json': {
+            'password': 'This field may not be blank.',
+        },
+    },
+    schema=serializers.TokenObtainPairSerializer,  # Тут нужно поменять
+)
+
+open_api_401_token = openapi.Response(
+    description='Unautorized',
+    examples={
+        'application/json': {
+            'detail': 'Token is invalid or expired',
+            'code': 'token_not_valid'
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_401_token_type = openapi.Response(
+    description='Unautorized',
+    examples={
+        'application/json': {
+            'detail': 'Token has wrong type',
+            'code': 'token_not_valid'
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_401_tasks_token = openapi.Response(
+    description='Unautorized',
+    examples={
+        'application/json': {
+           'detail': "Given token not valid for any token type",
+            'code': "token_not_valid",
+            'messages': [
+                {
+                    'token_class': 'AccessToken',
+                    'token_type': 'access',
+                    'message': 'Token is invalid or expired'
+                }
+            ]
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_304 = openapi.Response(
+    description='Not Modified (the If-None-Match ETag is still current)',
+)
+
+open_api_404 = openapi.Response(
+    description='Not found',
+    examples={
+        'application/json': {
+            'detail': 'Not found.'
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+open_api_415 = openapi.Response(
+    description='Unsupported Media Type',
+    examples={
+        'application/json': {
+            'detail': 'Unsupported media type "text/plain" in request.'
+        },
+    },
+    schema=TaskSerializer,  # Тут нужно поменять
+)
+
+
+year_param = openapi.Parameter(
+    'year',
+    openapi.IN_QUERY,
+    description='year in start_date field',
+    type=openapi.TYPE_NUMBER
+)
+
+month_param = openapi.Parameter(
+    'month',
+    openapi.IN_QUERY,
+    description='month in start_date field',
+    type=openapi.TYPE_NUMBER
+)
+
+day_param = openapi.Parameter(
+    'day',
+    openapi.IN_QUERY,
+    description='day in start_date field',
+    type=openapi.TYPE_NUMBER
+)
+
+from_param = openapi.Parameter(
+    'from',
+    openapi.IN_QUERY,
+    description='first day of the window (inclusive)',
+    type=openapi.TYPE_STRING,
+    format=openapi.FORMAT_DATE,
+)
+
+to_param = openapi.Parameter(
+    'to',
+    openapi.IN_QUERY,
+    description='last day of the window (inclusive)',
+    type=openapi.TYPE_STRING,
+    format=openapi.FORMAT_DATE,
+)
+
+cursor_param = openapi.Parameter(
+    'cursor',
+    openapi.IN_QUERY,
+    description='cursor from the next link of the previous page',
+    type=openapi.TYPE_STRING,
+)
+
+page_size_param = openapi.Parameter(
+    'page_size',
+    openapi.IN_QUERY,
+    description='number of tasks per page, enables pagination',
+    type=openapi.TYPE_NUMBER,
+)
+
+stream_param = openapi.Parameter(
+    'stream',
+    openapi.IN_QUERY,
+    description='stream all tasks without pagination; '
+                'Accept: application/x-ndjson streams NDJSON lines',
+    type=openapi.TYPE_BOOLEAN,
+)
+
+ids_param = openapi.Parameter(
+    'ids',
+    openapi.IN_QUERY,
+    description='comma separated ids of the tasks',
+    type=openapi.TYPE_STRING,
+    required=True,
+)
+
+since_param = openapi.Parameter(
+    'since',
+    openapi.IN_QUERY,
+    description='sync token returned as "next" by the previous call',
+    type=openapi.TYPE_STRING,
+)
+
+
+# POST /register/
+register_create = dict(
+    security=[{'Basic': []}],
+    responses={
+        '201': openapi.Response(
+            description='Created',
+            examples={
+                'application/json': {
+                    'username': 'string',
+                    'email': 'user@example.com',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400': open_api_400_blank_username,
+        '400 (blank email)': open_api_400_blank_email,
+        '400 (blank password)': open_api_400_blank_password,
+        '400 (exist username)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'username': 'A user with that username already exists.',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400 (exist email)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'email': 'A user with this email already exist',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400 (password 8 char)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'password': 'This password is too short. It must contain at least 8 characters.',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400 (password num)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'password': 'This password is entirely numeric.',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400 (password up)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'password': 'This password must contain at least 1 upper case letter.',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '400 (password special)': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'password': 'This password must contain at least 1 special character.',
+                },
+            },
+            schema=RegisterSerializer,
+        ),
+        '415': open_api_415,
+    }
+)
+
+
+# GET /tasks/statuses/
+task_statuses = dict(
+    manual_parameters=[year_param, month_param, from_param, to_param],
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': [
+                    {
+                        'date': '2019-08-24',
+                        'completed': True,
+                        'not_completed': True,
+                    }
+                ]
+            },
+            schema=TaskStatusesSerializer,
+        ),
+        '304': open_api_304,
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': {
+                    'month': 'Year is required with month.',
+                },
+            },
+            schema=TaskStatusesSerializer,
+        ),
+        '401': open_api_401_tasks_token,
+    }
+)
+
+
+# GET /tasks/
+task_list = dict(
+    manual_parameters=[
+        year_param, month_param, day_param, cursor_param, page_size_param,
+        stream_param,
+    ],
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': [
+                    example_task,
+                ]
+            },
+            schema=TaskSerializer,
+        ),
+        '200 (paginated)': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'next': 'http://testserver/api/v1/tasks/'
+                            '?cursor=MjAyMi0wNi0wNVQxMDoxNTowMCswMDowMHwx'
+                            '&page_size=1',
+                    'results': [
+                        example_task,
+                    ],
+                },
+            },
+            schema=TaskSerializer,
+        ),
+        '304': open_api_304,
+        '401': open_api_401_tasks_token,
+        '404 (invalid cursor)': openapi.Response(
+            description='Not found',
+            examples={
+                'application/json': {
+                    'detail': 'Invalid cursor',
+                },
+            },
+            schema=TaskSerializer,
+        ),
+    }
+)
+
+
+# DELETE /tasks/{id}/
+task_destroy = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '204': openapi.Response(
+            description='No content',
+        ),
+        '401': open_api_401_tasks_token,
+        '404': open_api_404,
+    }
+)
+
+
+# PUT /tasks/{id}/
+task_update = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': example_task,
+            },
+            schema=TaskSerializer,
+        ),
+        '400': open_api_400_required_title,
+        '400 (required start_date)': open_api_400_required_start_date,
+        '400 (required end_date)': open_api_400_required_end_date,
+        '400 (blank title)': open_api_400_blank_title,
+        '400 (blank start_date)': open_api_400_blank_start_date,
+        '400 (blank end_date)': open_api_400_blank_end_date,
+        '401': open_api_401_tasks_token,
+        '404': open_api_404,
+        '415': open_api_415,
+    }
+)
+
+
+# PATCH /tasks/{id}/
+task_partial_update = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': example_task,
+            },
+            schema=TaskSerializer,
+        ),
+        '401': open_api_401_tasks_token,
+        '404': open_api_404,
+        '415': open_api_415,
+    }
+)
+
+
+# GET /tasks/{id}/
+task_retrieve = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': example_task,
+            },
+            schema=TaskSerializer,
+        ),
+        '304': open_api_304,
+        '401': open_api_401_tasks_token,
+        '404': open_api_404,
+    }
+)
+
+
+# POST /tasks/
+task_create = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '201': openapi.Response(
+            description='Created',
+            examples={
+                'application/json': example_task,
+            },
+            schema=TaskSerializer,
+        ),
+        '400': open_api_400_required_title,
+        '400 (required start_date)': open_api_400_required_start_date,
+        '400 (required end_date)': open_api_400_required_end_date,
+        '400 (blank title)': open_api_400_blank_title,
+        '400 (blank start_date)': open_api_400_blank_start_date,
+        '400 (blank end_date)': open_api_400_blank_end_date,
+        '401': open_api_401_tasks_token,
+        '415': open_api_415,
+    }
+)
+
+
+# POST /tasks/bulk/
+task_bulk = dict(
+    request_body=TaskSerializer(many=True),
+    security=[{'Bearer': []}],
+    responses={
+        '201': openapi.Response(
+            description='Created',
+            examples={
+                'application/json': [
+                    example_task,
+                ],
+            },
+            schema=TaskSerializer(many=True),
+        ),
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': [
+                    {},
+                    {
+                        'title': 'This field is required.',
+                    },
+                ],
+            },
+            schema=TaskSerializer(many=True),
+        ),
+        '400 (not a list)': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': {
+                    'non_field_errors': 'Expected a list of items but '
+                                        'got type "dict".',
+                },
+            },
+            schema=TaskSerializer(many=True),
+        ),
+        '401': open_api_401_tasks_token,
+        '415': open_api_415,
+    }
+)
+
+
+# PATCH /tasks/bulk/
+task_bulk_update = dict(
+    request_body=TaskSerializer(many=True),
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': [
+                    example_task,
+                ],
+            },
+            schema=TaskSerializer(many=True),
+        ),
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': [
+                    {},
+                    {
+                        'id': 'Not found.',
+                    },
+                ],
+            },
+            schema=TaskSerializer(many=True),
+        ),
+        '401': open_api_401_tasks_token,
+        '415': open_api_415,
+    }
+)
+
+
+# DELETE /tasks/bulk/
+task_bulk_destroy = dict(
+    manual_parameters=[ids_param],
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'deleted': [1, 2],
+                    'not_found': [3],
+                },
+            },
+        ),
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': {
+                    'ids': 'A valid integer is required.',
+                },
+            },
+        ),
+        '401': open_api_401_tasks_token,
+    }
+)
+
+
+# POST /tasks/complete/
+task_complete = dict(
+    request_body=TaskCompleteSerializer,
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'updated': 3,
+                },
+            },
+        ),
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': {
+                    'date': 'This field is required.',
+                },
+            },
+            schema=TaskCompleteSerializer,
+        ),
+        '401': open_api_401_tasks_token,
+        '415': open_api_415,
+    }
+)
+
+
+# GET /tasks/changes/
+task_changes = dict(
+    manual_parameters=[since_param],
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'changed': [
+                        example_task,
+                    ],
+                    'deleted': [2, 3],
+                    'next': 'MjA4MjU6MjAyMi0wNi0wNVQxMDoxNTowMC4xMjM0NTYr'
+                            'MDA6MDA',
+                },
+            },
+        ),
+        '400': openapi.Response(
+            description='Bad Request',
+            examples={
+                'application/json': {
+                    'since': 'Invalid token.',
+                },
+            },
+        ),
+        '401': open_api_401_tasks_token,
+        '410': openapi.Response(
+            description='Gone',
+            examples={
+                'application/json': {
+                    'detail': 'Sync token has expired, '
+                              'fetch all tasks again.',
+                },
+            },
+        ),
+    }
+)
+
+
+# POST /refresh-token/
+token_refresh = dict(
+    security=[{'Basic': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'access': '36symbols.150symbols.43symbols',
+                },
+            },
+            schema=serializers.TokenRefreshSerializer,  # Тут нужно поменять
+        ),
+        '400': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'refresh': 'This field may not be blank.'
+                },
+            },
+            schema=serializers.TokenRefreshSerializer,  # Тут нужно поменять
+        ),
+        '401': open_api_401_token,
+        '401 (type)': open_api_401_token_type,
+        '415': open_api_415,
+    }
+)
+
+
+# POST /verify-token/
+token_verify = dict(
+    security=[{'Basic': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {},
+            },
+            schema=serializers.TokenVerifySerializer,
+        ),
+        '400': openapi.Response(
+            description='Bad request',
+            examples={
+                'application/json': {
+                    'token': 'This field may not be blank.',
+                },
+            },
+            schema=serializers.TokenVerifySerializer,
+        ),
+        '401': open_api_401_token,
+        '415': open_api_415,
+    }
+)
+
+
+# GET /token-cache-stats/
+token_cache_stats = dict(
+    security=[{'Bearer': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'size': 120,
+                    'max_size': 10000,
+                    'hits': 5230,
+                    'misses': 180,
+                },
+            },
+        ),
+        '401': open_api_401_tasks_token,
+        '403': openapi.Response(
+            description='Forbidden',
+            examples={
+                'application/json': {
+                    'detail': 'You do not have permission to perform '
+                              'this action.',
+                },
+            },
+        ),
+    }
+)
+
+
+# POST /login/
+token_obtain_pair = dict(
+    security=[{'Basic': []}],
+    responses={
+        '200': openapi.Response(
+            description='Ok',
+            examples={
+                'application/json': {
+                    'refresh': '36symbols.150symbols.43symbols',
+                    'access': '36symbols.150symbols.43symbols',
+                },
+            },
+            schema=serializers.TokenObtainPairSerializer,
+        ),
+        '400': open_api_400_blank_username,
+        '400 (blank password)': open_api_400_blank_password,
+        '401': openapi.Response(
+            description='Unauthorized',
+            examples={
+                'application/json': {
+                    'detail': 'No active account found with the given credentials'
+                },
+            },
+            schema=serializers.TokenObtainPairSerializer,
+        ),
+        '415': open_api_415,
+    }
+)
+
+
+schema_view = get_schema_view(
+   openapi.Info(
+      title="Snippets API",
+      default_version='v1',
+      description="Test description",
+      terms_of_service="https://www.google.com/policies/terms/",
+      contact=openapi.Contact(email="contact@snippets.local"),
+      license=openapi.License(name="BSD License"),
+   ),
+   public=True,
+   permission_classes=[permissions.AllowAny],
+)
+
+urlpatterns = [
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$',
+            schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0),
+         name='schema-swagger-ui'),
+    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0),
+         name='schema-redoc'),
+]
@@ -2,18 +2,31 @@ from rest_framework.views import exception_handler
 from rest_framework.validators import ValidationError
 
 
+def get_error_message(errors):
+    field, error = list(errors.items())[0]
+    if isinstance(error, list):
+        error_message = error[0]
+    elif isinstance(error, dict):
+        error_message = list(error.items())[0][1]
+    else:
+        error_message = error
+
+    return {field: error_message}
+
+
 def api_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
     if isinstance(exc, ValidationError):
-        field, error = list(response.data.items())[0]
-        if isinstance(error, list):
-            error_message = error[0]
-        elif isinstance(error, dict):
-            error_message = list(error.items())[0][1]
+        if isinstance(response.data, list):
+            # Errors of a list of items: one message per invalid item and
+            # an empty dict for every valid one.
+            response.data = [
+                get_error_message(errors)
+                if errors and isinstance(errors, dict) else errors
+                for errors in response.data
+            ]
         else:
-            error_message = error
-
-        response.data = {field: error_message}
+            response.data = get_error_message(response.data)
 
     return response
@@ -0,0 +1,163 @@
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+def get_int_param(query_params, name, min_value, max_value):
+    if name not in query_params:
+        return None
+
+    try:
+        value = int(query_params.get(name))
+    except (TypeError, ValueError):
+        raise ValidationError({name: 'A valid integer is required.'})
+
+    if not min_value <= value <= max_value:
+        raise ValidationError(
+            {name: f'Ensure this value is between {min_value} '
+                   f'and {max_value}.'}
+        )
+    return value
+
+
+def get_ids_param(query_params, name):
+    """Parse a required comma separated list of ids."""
+    value = query_params.get(name)
+    if not value:
+        raise ValidationError({name: 'This field is required.'})
+
+    try:
+        return [int(pk) for pk in value.split(',')]
+    except ValueError:
+        raise ValidationError({name: 'A valid integer is required.'})
+
+
+def get_date_param(query_params, name):
+    if name not in query_params:
+        return None
+
+    try:
+        value = parse_date(query_params.get(name))
+    except ValueError:
+        value = None
+
+    if value is None:
+        raise ValidationError(
+            {name: 'Date has wrong format. Use one of these formats '
+                   'instead: YYYY-MM-DD.'}
+        )
+    return value
+
+
+def make_aware(year, month=1, day=1):
+    return timezone.make_aware(datetime(year, month, day))
+
+
+def month_window(year, month=None):
+    """Return the half-open [start, end) range of a year or a month."""
+    if month is None:
+        return make_aware(year), make_aware(year + 1)
+
+    if month == 12:
+        return make_aware(year, month), make_aware(year + 1)
+    return make_aware(year, month), make_aware(year, month + 1)
+
+
+def day_window(year, month, day):
+    """Return the half-open [start, end) range of a day or None.
+
+    The end of the last representable day is None (open-ended).
+    """
+    try:
+        start = date(year, month, day)
+    except ValueError:
+        return None
+
+    if start == date.max:
+        return make_aware(start.year, start.month, start.day), None
+
+    end = start + timedelta(days=1)
+    return (
+        make_aware(start.year, start.month, start.day),
+        make_aware(end.year, end.month, end.day),
+    )
+
+
+def get_date_window(query_params):
+    """Build the [start, end) window of ``from``/``to`` or ``year``/``month``.
+
+    ``from`` and ``to`` are inclusive dates, ``year`` (optionally with
+    ``month``) selects a whole year or month. Missing bounds are None.
+    """
+    start = end = None
+
+    year = get_int_param(query_params, 'year', 1, 9998)
+    month = get_int_param(query_params, 'month', 1, 12)
+    if month is not None and year is None:
+        raise ValidationError({'month': 'Year is required with month.'})
+    if year is not None:
+        start, end = month_window(year, month)
+
+    date_from = get_date_param(query_params, 'from')
+    date_to = get_date_param(query_params, 'to')
+    if date_from and date_to and date_from > date_to:
+        raise ValidationError(
+            {'to': 'To date must be greater than or equal to from date.'}
+        )
+
+    if date_from is not None:
+        date_from = make_aware(date_from.year, date_from.month, date_from.day)
+        start = max(start, date_from) if start else date_from
+    if date_to is not None and date_to < date.max:
+        date_to += timedelta(days=1)
+        date_to = make_aware(date_to.year, date_to.month, date_to.day)
+        end = min(end, date_to) if end else date_to
+
+    return start, end
+
+
+def filter_by_date_window(queryset, query_params):
+    start, end = get_date_window(query_params)
+
+    if start is not None:
+        queryset = queryset.filter(start_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(start_date__lt=end)
+    return queryset
+
+
+def filter_by_start_date(queryset, query_params):
+    """Filter by ``year``, ``month`` and ``day`` of the start date.
+
+    The leading parts (year, year + month, year + month + day) become one
+    half-open range on start_date, which can use the (user, start_date)
+    index. A month or day given without the parts before it still needs
+    the ``EXTRACT`` lookups.
+    """
+    year = get_int_param(query_params, 'year', 1, 9998)
+    month = get_int_param(query_params, 'month', 1, 12)
+    day = get_int_param(query_params, 'day', 1, 31)
+
+    if year is None:
+        if month is not None:
+            queryset = queryset.filter(start_date__month=month)
+        if day is not None:
+            queryset = queryset.filter(start_date__day=day)
+        return queryset
+
+    if month is not None and day is not None:
+        window = day_window(year, month, day)
+        if window is None:
+            return queryset.none()
+    else:
+        window = month_window(year, month)
+        if day is not None:
+            queryset = queryset.filter(start_date__day=day)
+
+    start, end = window
+    queryset = queryset.filter(start_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(start_date__lt=end)
+    return queryset
@@ -0,0 +1,70 @@
+"""Password hashers with costs from settings and a concurrency limit.
+
+``PASSWORD_HASHER`` picks the hasher new passwords are hashed with; the
+other ones stay listed so existing hashes are still verified and
+rehashed with the preferred hasher on the next successful login.
+Changing a cost setting rehashes on login the same way.
+
+Hashing is CPU bound, so at most ``PASSWORD_HASHING_CONCURRENCY``
+hashes run at once in each process: a burst of logins or registrations
+waits for a slot instead of taking every core away from the other
+requests. The waiting requests still hold their worker thread, the login
+and register views being synchronous.
+"""
+import threading
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+_semaphore = None
+_semaphore_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        with _semaphore_lock:
+            if _semaphore is None:
+                _semaphore = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASHING_CONCURRENCY
+                )
+    return _semaphore
+
+
+def run_limited(func, *args, **kwargs):
+    """Run ``func`` once one of the hashing slots is free."""
+    # Nested calls, like PBKDF2's verify() calling encode(), already
+    # hold a slot.
+    if getattr(_local, 'hashing', False):
+        return func(*args, **kwargs)
+    with get_semaphore():
+        _local.hashing = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.hashing = False
+
+
+class LimitedHasherMixin:
+
+    def encode(self, password, salt, *args, **kwargs):
+        return run_limited(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return run_limited(super().verify, password, encoded)
+
+
+class Argon2PasswordHasher(LimitedHasherMixin, hashers.Argon2PasswordHasher):
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(LimitedHasherMixin, hashers.ScryptPasswordHasher):
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+
+class PBKDF2PasswordHasher(LimitedHasherMixin, hashers.PBKDF2PasswordHasher):
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
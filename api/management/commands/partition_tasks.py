@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.partitions import (
+    create_partitions,
+    get_partitions,
+    partition_table,
+    unpartition_table,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the monthly partitions of the task table for this month '
+        'and the next TASKS_PARTITIONS_AHEAD months. --enable converts '
+        'the table to a partitioned one first, --disable converts it back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int,
+            help='months ahead (default: TASKS_PARTITIONS_AHEAD)',
+        )
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            '--enable', action='store_true',
+            help='partition the table, copying its rows',
+        )
+        group.add_argument(
+            '--disable', action='store_true',
+            help='convert the table back to a plain one, copying its rows',
+        )
+
+    def handle(self, *args, **options):
+        if options['disable']:
+            if unpartition_table():
+                self.stdout.write('Task table is no longer partitioned.')
+            return
+
+        if options['enable'] and partition_table():
+            self.stdout.write('Partitioned the task table.')
+
+        with connection.cursor() as cursor:
+            if not get_partitions(cursor):
+                raise CommandError(
+                    'The task table is not partitioned, use --enable.'
+                )
+
+        created = create_partitions(options['months'])
+        self.stdout.write(f'Created {len(created)} partitions.')
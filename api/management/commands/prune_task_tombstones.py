@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete tombstones of deleted tasks older than '
+        'TASKS_SYNC_RETENTION days.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(f'Deleted {deleted} tombstones.')
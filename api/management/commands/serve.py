@@ -0,0 +1,120 @@
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from gunicorn.app.base import BaseApplication
+
+
+def get_default_workers(interface):
+    """Workers for the CPUs of the machine.
+
+    WSGI workers block on the database half of the time, so there are
+    two per CPU (plus one); an ASGI worker keeps its CPU busy on its own.
+    """
+    cpus = os.cpu_count() or 1
+    return 2 * cpus + 1 if interface == 'wsgi' else cpus
+
+
+def is_cache_shared():
+    """Whether the workers share the cache.
+
+    The generations of api.cache (cached responses, ETags, replica
+    pinning) must be seen by every worker, or the others keep serving
+    stale responses after a write.
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def get_options(interface, bind, workers, threads):
+    """Return the gunicorn settings for serving the project."""
+    options = {
+        'bind': bind,
+        'workers': workers or get_default_workers(interface),
+        # The application is loaded once and the workers share its memory
+        # copy-on-write.
+        'preload_app': True,
+        # Connections opened while loading are not shared with workers.
+        'when_ready': lambda server: connections.close_all(),
+        'accesslog': '-',
+        'max_requests': settings.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': settings.SERVER_MAX_REQUESTS // 10,
+    }
+    if interface == 'asgi':
+        options['worker_class'] = 'uvicorn.workers.UvicornWorker'
+    else:
+        # More than one thread makes gunicorn use gthread workers.
+        options['threads'] = threads or 1
+    return options
+
+
+class GunicornApplication(BaseApplication):
+
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve the project with gunicorn: pre-forked workers sharing the '
+        'preloaded application. Migrations are not run, use migrate.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interface', choices=['wsgi', 'asgi'],
+            default=settings.SERVER_INTERFACE,
+            help='wsgi (sync workers) or asgi (uvicorn workers)',
+        )
+        parser.add_argument(
+            '--bind', default=settings.SERVER_BIND,
+            help='address to listen on',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.SERVER_WORKERS,
+            help='worker processes (default: from the CPU count)',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.SERVER_THREADS,
+            help='threads of each WSGI worker (default: 1)',
+        )
+
+    def handle(self, *args, **options):
+        interface = options['interface']
+        if interface == 'asgi':
+            from ToDoCalendar.asgi import (
+                application,
+                close_connections_per_request,
+            )
+
+            # Again, in case the entry point was imported before.
+            close_connections_per_request()
+        else:
+            from django.core.wsgi import get_wsgi_application
+            application = get_wsgi_application()
+
+        gunicorn_options = get_options(
+            interface,
+            options['bind'],
+            options['workers'],
+            options['threads'],
+        )
+        workers = gunicorn_options['workers']
+        if workers > 1 and not is_cache_shared():
+            self.stderr.write(
+                f'Serving with 1 worker instead of {workers}: the cache is '
+                'not shared by the workers, set REDIS_URL.'
+            )
+            gunicorn_options['workers'] = 1
+        GunicornApplication(application, gunicorn_options).run()
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.db.backends.signals import connection_created
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+
+from .timing import add_query_recorder, get_timing, request_timing
+
+logger = logging.getLogger(__name__)
+
+
+class NonAPIMiddleware(MiddlewareMixin):
+    """Run the ``NON_API_MIDDLEWARE`` stack, except for API requests.
+
+    Requests under ``API_PATH_PREFIX`` are authenticated by their bearer
+    token and use neither sessions nor messages, so they skip session
+    loading, the lazy ``request.user`` and the CSRF checks. Other
+    requests (admin, swagger) go through the stack as if it was listed
+    in ``MIDDLEWARE`` in place of this middleware.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        # Chained like BaseHandler.load_middleware() does.
+        handler = get_response
+        for middleware_path in reversed(settings.NON_API_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(middleware, 'process_view'):
+                self.view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                self.template_response_middleware.append(
+                    middleware.process_template_response
+                )
+            if hasattr(middleware, 'process_exception'):
+                self.exception_middleware.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.handler = handler
+
+    def is_api_request(self, request):
+        return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+    def __call__(self, request):
+        if self.is_api_request(request):
+            return self.get_response(request)
+        return self.handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api_request(request):
+            return None
+
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if not self.is_api_request(request):
+            for process_template_response in self.template_response_middleware:
+                response = process_template_response(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_api_request(request):
+            return None
+
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
+
+
+class RequestTimingMiddleware(MiddlewareMixin):
+    """Time requests and log the slow ones.
+
+    ``REQUEST_TIMING_SAMPLE_RATE`` of the requests are timed in detail
+    (see api.timing): their responses get a ``Server-Timing`` header with
+    the number of queries and the time spent in the database, serializing
+    and rendering. Requests taking more than ``REQUEST_TIMING_SLOW_MS``
+    are logged as ``key=value`` fields, with these details when sampled.
+    Streamed content is produced after the response leaves the
+    middleware, so it is not timed.
+
+    Listed first in ``MIDDLEWARE``, so that the timings cover the other
+    middleware too.
+    """
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.slow_ms = settings.REQUEST_TIMING_SLOW_MS
+        if not self.sample_rate and not self.slow_ms:
+            raise MiddlewareNotUsed()
+        if self.sample_rate:
+            connection_created.connect(
+                add_query_recorder, dispatch_uid='api.timing'
+            )
+        super().__init__(get_response)
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+
+    def is_sampled(self):
+        return self.sample_rate and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        if not self.is_sampled():
+            response = self.get_response(request)
+            self.log_if_slow(request, response, start)
+            return response
+
+        with request_timing() as timing:
+            response = self.get_response(request)
+        return self.process_timing(request, response, timing)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        if not self.is_sampled():
+            response = await self.get_response(request)
+            self.log_if_slow(request, response, start)
+            return response
+
+        with request_timing() as timing:
+            response = await self.get_response(request)
+        return self.process_timing(request, response, timing)
+
+    def process_template_response(self, request, response):
+        timing = get_timing()
+        if timing is not None:
+            # Called last before the response is rendered.
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: timing.add(
+                    'render', time.perf_counter() - start
+                )
+            )
+        return response
+
+    def process_timing(self, request, response, timing):
+        response['Server-Timing'] = timing.server_timing()
+        self.log_if_slow(request, response, timing.start, timing)
+        return response
+
+    def log_if_slow(self, request, response, start, timing=None):
+        total_ms = (time.perf_counter() - start) * 1000
+        if not self.slow_ms or total_ms < self.slow_ms:
+            return
+
+        match = request.resolver_match
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+        }
+        if timing is not None:
+            fields['queries'] = timing.queries
+            fields['db_ms'] = round(timing.db * 1000, 2)
+            for name, seconds in timing.durations.items():
+                fields[f'{name}_ms'] = round(seconds * 1000, 2)
+
+        logger.warning(
+            'Slow request %s',
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'timing': fields},
+        )
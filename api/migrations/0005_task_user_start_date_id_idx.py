@@ -0,0 +1,21 @@
+# Generated by Django 4.0.6 on 2026-10-17 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_task_user_start_date_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='api_task_user_start_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'start_date', 'id'], name='api_task_user_start_date_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Make emails of users unique regardless of case.
+
+    auth.User belongs to django.contrib.auth, so the functional index is
+    created with SQL instead of a constraint on the model. Blank emails
+    (users created without one, e.g. by createsuperuser) are left out.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('api', '0006_task_updated_at_tasktombstone'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX auth_user_email_lower_uniq "
+            "ON auth_user (lower(email)) WHERE email <> ''",
+            reverse_sql='DROP INDEX auth_user_email_lower_uniq',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.6 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_auth_user_email_lower_uniq'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['start_date', 'id'], name='api_task_start_date_idx'),
+        ),
+    ]
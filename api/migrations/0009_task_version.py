@@ -0,0 +1,44 @@
+# Generated by Django 4.0.6 on 2026-10-18 01:34
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_task_start_date_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='api_task_user_updated_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tasktombstone',
+            name='api_tombstone_user_deleted_idx',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='updated_at',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=api.models.TransactionIdField(default=0, editable=False, verbose_name='version'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='version',
+            field=api.models.TransactionIdField(default=0, editable=False, verbose_name='version'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'version'], name='api_task_user_version_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['user', 'version'], name='api_tombstone_user_version_idx'),
+        ),
+    ]
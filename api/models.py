@@ -1,10 +1,56 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.aggregates import BoolOr
 from django.db import models
+from django.db.models.functions import TruncDay
 
 
 User = get_user_model()
 
 
+class TaskQuerySet(models.QuerySet):
+
+    def statuses(self):
+        """Return one row per day with completed/not completed flags.
+
+        The rollup is done by the database (``date_trunc`` + ``bool_or``
+        grouped by day), so only one small dict per day is fetched.
+        """
+        not_completed = models.ExpressionWrapper(
+            models.Q(completed=False),
+            output_field=models.BooleanField(),
+        )
+        return (
+            self.order_by()
+            .annotate(date=TruncDay('start_date'))
+            .values('date')
+            # not_completed goes first: once the ``completed`` annotation
+            # exists it shadows the model field of the same name.
+            .annotate(
+                not_completed=BoolOr(not_completed),
+                completed=BoolOr('completed'),
+            )
+            .order_by('date')
+        )
+
+
+class TransactionId(models.Func):
+    """The id of the current transaction, assigned by PostgreSQL."""
+    function = 'txid_current'
+    output_field = models.BigIntegerField()
+
+
+class TransactionIdField(models.BigIntegerField):
+    """Id of the transaction of the last write of the row.
+
+    The database sets it on ``save()`` and ``bulk_create()``;
+    ``bulk_update()`` and ``update()`` have to set it to
+    ``TransactionId()`` explicitly.
+    """
+
+    def pre_save(self, model_instance, add):
+        return TransactionId()
+
+
 class Task(models.Model):
     title = models.CharField(verbose_name='title', max_length=255)
     description = models.TextField(
@@ -17,8 +63,60 @@ class Task(models.Model):
 
     completed = models.BooleanField(default=False)
 
+    # Last write, read by GET /tasks/changes/ (see api.sync).
+    version = TransactionIdField(
+        verbose_name='version', default=0, editable=False
+    )
+
+    # Lookups by user are served by the (user, start_date, id) index below.
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
-        related_name='tasks'
+        related_name='tasks',
+        db_index=False,
     )
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'start_date', 'id'],
+                name='api_task_user_start_date_idx',
+            ),
+            models.Index(
+                fields=['user', 'version'],
+                name='api_task_user_version_idx',
+            ),
+            # Ordering and date hierarchy of the admin (see api.admin).
+            models.Index(
+                fields=['start_date', 'id'],
+                name='api_task_start_date_idx',
+            ),
+        ]
+
+
+class TaskTombstone(models.Model):
+    """A deleted task, kept so that sync clients learn about deletion."""
+    task_id = models.BigIntegerField(verbose_name='task id')
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='task_tombstones',
+        db_index=False,
+    )
+    deleted_at = models.DateTimeField(
+        verbose_name='deleted at',
+        auto_now_add=True,
+    )
+    version = TransactionIdField(
+        verbose_name='version', default=0, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'version'],
+                name='api_tombstone_user_version_idx',
+            ),
+        ]
@@ -0,0 +1,118 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskCursorPagination(BasePagination):
+    """Keyset pagination of tasks ordered by (start_date, id).
+
+    The cursor is an opaque token holding the position of the last task
+    of the page, and the next page is selected with
+    ``(start_date, id) > position`` on the (user, start_date, id) index,
+    so deep pages cost the same as the first one and rows inserted
+    concurrently never shift the pages.
+
+    Pages are built from ``values()`` rows of the queryset.
+
+    Pagination is opt-in: without ``cursor`` and ``page_size`` query
+    parameters the list is returned unpaginated as before.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = getattr(settings, 'TASKS_PAGE_SIZE', 100)
+    max_page_size = getattr(settings, 'TASKS_MAX_PAGE_SIZE', 1000)
+    ordering = ('start_date', 'id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not (self.cursor_query_param in request.query_params
+                or self.page_size_query_param in request.query_params):
+            return None
+
+        page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            start_date, pk = position
+            queryset = queryset.filter(
+                Q(start_date__gt=start_date) | Q(id__gt=pk),
+                start_date__gte=start_date,
+            )
+
+        page = list(queryset.order_by(*self.ordering)[:page_size + 1])
+        self.next_position = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_position = self.get_position(page[-1])
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = self.page_size
+
+        if page_size <= 0:
+            page_size = self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(self, row):
+        return row['start_date'], row['id']
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def encode_cursor(self, position):
+        start_date, pk = position
+        cursor = f'{start_date.isoformat()}|{pk}'.encode()
+        return urlsafe_b64encode(cursor).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            cursor = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            start_date, pk = cursor.decode().split('|')
+            start_date = parse_datetime(start_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if start_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return start_date, pk
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
@@ -0,0 +1,224 @@
+"""Optional monthly range partitioning of the task table by start date.
+
+With ``TASKS_PARTITIONED`` the ``api_task`` table is a PostgreSQL
+partitioned table with one partition per month of ``start_date``
+(``api_task_p2022_03``) and a default partition (``api_task_default``)
+for the months without one. Listing and statuses filter a month or a
+year as a range of start dates, so PostgreSQL prunes the other
+partitions and the old months never bloat the indexes those requests
+use.
+
+``partition_table`` converts the existing table and copies its rows,
+``unpartition_table`` converts it back. ``create_partitions`` adds the
+partitions of the coming months, moving their rows out of the default
+partition; ``migrate`` runs it (see apps.py), and so does the
+``partition_tasks`` command, for a periodic job.
+
+The primary key of a partitioned table includes the partition key, so
+it is ``(id, start_date)``: ids stay unique through their sequence only.
+For the same reason, unique constraints cannot be added to Task.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .filters import month_window
+from .models import Task
+
+
+TABLE = Task._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def get_partition_name(year, month):
+    return f'{TABLE}_p{year}_{month:02d}'
+
+
+def add_months(year, month, months):
+    year, month = divmod(year * 12 + month - 1 + months, 12)
+    return year, month + 1
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        "SELECT relkind = 'p' FROM pg_class "
+        "WHERE oid = to_regclass(%s)",
+        [TABLE],
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def get_partitions(cursor):
+    """Return the names of the partitions of the task table."""
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i '
+        'JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = to_regclass(%s) '
+        'ORDER BY c.relname',
+        [TABLE],
+    )
+    return [name for name, in cursor.fetchall()]
+
+
+def get_table_definition(cursor):
+    """Return the primary key, index and foreign key DDL of the table.
+
+    Indexes and foreign keys keep the names Django gave them, so later
+    migrations still find them.
+    """
+    cursor.execute(
+        'SELECT conname FROM pg_constraint '
+        "WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+        [TABLE],
+    )
+    primary_key, = cursor.fetchone()
+
+    cursor.execute(
+        'SELECT pg_get_indexdef(indexrelid) FROM pg_index '
+        'WHERE indrelid = to_regclass(%s) AND NOT indisprimary',
+        [TABLE],
+    )
+    indexes = [definition for definition, in cursor.fetchall()]
+
+    cursor.execute(
+        'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [TABLE],
+    )
+    foreign_keys = cursor.fetchall()
+    return primary_key, indexes, foreign_keys
+
+
+def rebuild_table(cursor, partitioned):
+    """Copy the task table into a new (un)partitioned table.
+
+    The table is locked while its rows are copied and the indexes are
+    rebuilt.
+    """
+    old_table = f'{TABLE}_old'
+    primary_key, indexes, foreign_keys = get_table_definition(cursor)
+
+    # Deferred foreign key checks of rows written earlier in the
+    # transaction would prevent altering the table.
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(
+        "SELECT pg_get_serial_sequence(%s, 'id')", [TABLE]
+    )
+    sequence, = cursor.fetchone()
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old_table}')
+    cursor.execute(
+        f'CREATE TABLE {TABLE} '
+        f'(LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        + (' PARTITION BY RANGE (start_date)' if partitioned else '')
+    )
+
+    if partitioned:
+        cursor.execute(
+            f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT'
+        )
+        # Every month with tasks, and the coming ones.
+        cursor.execute(
+            f'SELECT DISTINCT '
+            f"date_part('year', start_date AT TIME ZONE %s)::int, "
+            f"date_part('month', start_date AT TIME ZONE %s)::int "
+            f'FROM {old_table}',
+            [settings.TIME_ZONE, settings.TIME_ZONE],
+        )
+        months = set(cursor.fetchall()) | set(get_coming_months())
+        for year, month in sorted(months):
+            # The end of December 9999 is out of range, the default
+            # partition keeps those.
+            if year < 9999:
+                create_partition(cursor, year, month)
+
+    cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {old_table}')
+    cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id')
+    cursor.execute(f'DROP TABLE {old_table}')
+
+    key = '(id, start_date)' if partitioned else '(id)'
+    cursor.execute(
+        f'ALTER TABLE {TABLE} ADD CONSTRAINT {primary_key} PRIMARY KEY {key}'
+    )
+    for definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}'
+        )
+    cursor.execute(f'ANALYZE {TABLE}')
+
+
+def partition_table():
+    """Convert the task table to a partitioned one, if it is not yet."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        if is_partitioned(cursor):
+            return False
+        rebuild_table(cursor, partitioned=True)
+        return True
+
+
+def unpartition_table():
+    """Convert the partitioned task table back to a plain one."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return False
+        rebuild_table(cursor, partitioned=False)
+        return True
+
+
+def get_coming_months(months=None):
+    """Return (year, month) of this month and the coming ones."""
+    if months is None:
+        months = settings.TASKS_PARTITIONS_AHEAD
+
+    today = timezone.localdate()
+    return [add_months(today.year, today.month, n) for n in range(months + 1)]
+
+
+def create_partition(cursor, year, month):
+    """Create the partition of a month, if it does not exist yet.
+
+    Its rows are moved out of the default partition first: a range
+    cannot be attached while the default partition has rows in it.
+    """
+    name = get_partition_name(year, month)
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+    if cursor.fetchone()[0]:
+        return False
+
+    start, end = month_window(year, month)
+    cursor.execute(
+        f'CREATE TABLE {name} '
+        f'(LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute(
+        f'WITH moved AS ('
+        f'DELETE FROM {DEFAULT_PARTITION} '
+        f'WHERE start_date >= %s AND start_date < %s RETURNING *'
+        f') INSERT INTO {name} SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(
+        f'ALTER TABLE {TABLE} ATTACH PARTITION {name} '
+        f'FOR VALUES FROM (%s) TO (%s)',
+        [start, end],
+    )
+    return True
+
+
+def create_partitions(months=None):
+    """Create the partitions of this month and the coming ones.
+
+    Returns the names of the created partitions.
+    """
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return created
+
+        for year, month in get_coming_months(months):
+            if create_partition(cursor, year, month):
+                created.append(get_partition_name(year, month))
+    return created
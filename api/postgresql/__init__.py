@@ -0,0 +1 @@
+"""PostgreSQL backend for persistent connections, see base.py."""
@@ -0,0 +1,43 @@
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend checking persistent connections before reuse.
+
+    With ``CONN_MAX_AGE`` a connection outlives the request, and the
+    server may drop it in between (restart, failover, idle timeout of a
+    pooler). With ``CONN_HEALTH_CHECKS`` the first query of a request on
+    a reused connection is preceded by ``SELECT 1``, and a broken
+    connection is replaced instead of failing the request. This is the
+    CONN_HEALTH_CHECKS setting of Django 4.1.
+    """
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        # Called when a request starts and finishes.
+        self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+        ):
+            return
+
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -0,0 +1,42 @@
+from itertools import islice
+
+from rest_framework.renderers import JSONRenderer
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Render a list as newline delimited JSON, one item per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        items = data if isinstance(data, list) else [data]
+        return b''.join(
+            super(NDJSONRenderer, self).render(item) + b'\n'
+            for item in items
+        )
+
+
+def stream_json(items, renderer, chunk_size):
+    """Yield ``items`` rendered chunk by chunk.
+
+    NDJSON renderers produce one line per item, other JSON renderers
+    produce the same bytes as rendering the whole list at once.
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+
+    if isinstance(renderer, NDJSONRenderer):
+        for chunk in chunks:
+            yield renderer.render(chunk)
+        return
+
+    separator = b',' if renderer.compact else b', '
+    prefix = b'['
+    for chunk in chunks:
+        yield prefix + renderer.render(chunk)[1:-1]
+        prefix = separator
+
+    yield b'[]' if prefix == b'[' else b']'
@@ -0,0 +1,89 @@
+"""Routing of task reads to read replicas.
+
+Reads go to the primary (``default``) unless they run in a
+``replica_reads`` block, which the read-only task endpoints use. Even
+then, a user who wrote to their tasks less than
+``DATABASE_REPLICA_PIN_TIMEOUT`` seconds ago reads from the primary, so
+they see their own writes however far the replicas lag behind, as long
+as the lag stays below the timeout.
+
+The time of the last write is the user's cache generation (see cache.py),
+which every task write already replaces. A user without one (a cold
+cache) counts as having just written. With more than one server
+process, the cache must be shared (``REDIS_URL``) for a write in one
+process to pin the user in the others.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .cache import get_generation
+
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def is_pinned(user_id):
+    """Return whether the user wrote too recently to read from replicas."""
+    written = time.time_ns() - get_generation(user_id)
+    return written < settings.DATABASE_REPLICA_PIN_TIMEOUT * 10 ** 9
+
+
+@contextmanager
+def replica_reads(user_id):
+    """Send the reads of the block to a replica, unless the user is pinned.
+
+    Does nothing without replicas.
+    """
+    enabled = bool(settings.DATABASE_REPLICAS) and not is_pinned(user_id)
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def iter_replica_reads(user_id, iterable):
+    """Iterate ``iterable`` in ``replica_reads``.
+
+    For the content of streamed responses, consumed after the view and
+    its ``replica_reads`` block returned.
+    """
+    with replica_reads(user_id):
+        yield from iterable
+
+
+def replica_reads_per_user(view_method):
+    """Run a read-only TaskViewSet action in ``replica_reads``."""
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        with replica_reads(request.user.pk):
+            return view_method(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """Database router sending ``replica_reads`` to a random replica."""
+
+    def db_for_read(self, model, **hints):
+        # Reads in a transaction must see its writes.
+        if (_replica_reads.get()
+                and not transaction.get_connection().in_atomic_block):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
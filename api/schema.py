@@ -0,0 +1,117 @@
+"""OpenAPI schema views generating the schema once per process.
+
+The schema only changes with the code, yet drf-yasg introspects every
+view on each request for it. The views of ``get_schema_view`` generate it
+once per version, for the spec formats and the web UIs alike, and render
+it once per format. Specs are served with a strong ETag and
+``Cache-Control: public, max-age=SCHEMA_CACHE_MAX_AGE``: clients and
+gateways revalidate with ``If-None-Match`` and get ``304 Not Modified``.
+
+Unless ``url`` is given, the cached schemas have no host, so they do not
+depend on the Host of the request generating them: clients use the host
+serving the schema.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from drf_yasg import views
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.renderers import (
+    OpenAPIRenderer,
+    SwaggerJSONRenderer,
+    SwaggerYAMLRenderer,
+)
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
+SPEC_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+
+
+def get_schema_view(info=None, url=None, patterns=None, urlconf=None,
+                    **kwargs):
+    """Same as drf-yasg's ``get_schema_view``, with cached schemas.
+
+    Only useful with ``public=True``: the schema is the same for every
+    user.
+    """
+    info = info or swagger_settings.DEFAULT_INFO
+    base_view = views.get_schema_view(info, url, patterns, urlconf, **kwargs)
+
+    class CachedSchemaView(base_view):
+        # Bound of the entries of each cache, in case of versioning
+        max_cached = 16
+        # version -> schema
+        schemas = {}
+        # (format, version) -> (ETag, content)
+        rendered = {}
+        lock = threading.Lock()
+
+        def cache(self, entries, key, get_value):
+            """Return ``entries[key]``, stored from ``get_value()``."""
+            with self.lock:
+                if key not in entries:
+                    while len(entries) >= self.max_cached:
+                        del entries[next(iter(entries))]
+                    entries[key] = get_value()
+                return entries[key]
+
+        def generate_schema(self, request, version):
+            generator = self.generator_class(
+                info, version, url, patterns, urlconf
+            )
+            schema = generator.get_schema(request, self.public)
+            if schema is None:
+                raise PermissionDenied()
+            if url is None:
+                schema.pop('host', None)
+                schema.pop('schemes', None)
+            return schema
+
+        def get(self, request, version='', format=None):
+            version = request.version or version or ''
+            schema = self.cache(
+                self.schemas, version,
+                lambda: self.generate_schema(request, version),
+            )
+            renderer = request.accepted_renderer
+            # The web UIs load the schema from the same view, in a spec
+            # format.
+            if not isinstance(renderer, SPEC_RENDERERS):
+                return Response(schema)
+
+            def render():
+                content = renderer.render(
+                    schema, renderer.media_type, self.get_renderer_context()
+                )
+                # Formats with the same content have their own ETag.
+                etag = hashlib.md5(content)
+                etag.update(renderer.format.encode())
+                return quote_etag(etag.hexdigest()), content
+
+            etag, content = self.cache(
+                self.rendered, (renderer.format, version), render
+            )
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(
+                    content,
+                    content_type=f'{renderer.media_type}; '
+                                 f'charset={renderer.charset}',
+                )
+            response['ETag'] = etag
+            patch_cache_control(
+                response, public=True, max_age=settings.SCHEMA_CACHE_MAX_AGE
+            )
+            patch_vary_headers(response, ['Accept'])
+            return response
+
+    return CachedSchemaView
@@ -1,36 +1,248 @@
-from rest_framework import serializers
+from collections.abc import Mapping
+from contextlib import nullcontext
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from rest_framework_simplejwt.serializers import TokenVerifySerializer
+from rest_framework_simplejwt.settings import (
+    api_settings as simplejwt_settings,
+)
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .models import Task, TransactionId
+from .timing import timed
+from .tokens import get_verified_token, is_blacklist_enabled
+
+
+class TimedDataMixin:
+    """Time the ``data`` of serializers as serialization (see api.timing)."""
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
 
-from .models import Task
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
 
 
 class RegisterSerializer(serializers.ModelSerializer):
+    """Register a user with a single INSERT.
+
+    Usernames and emails (regardless of case) are unique in the database,
+    so duplicates are reported from the IntegrityError of the INSERT
+    rather than looked up first. They are only probed when the data is
+    invalid anyway, to report every error of the request together.
+    """
+    default_error_messages = {
+        'username_exists': 'A user with that username already exists.',
+        'email_exists': 'A user with this email already exist',
+    }
+    # Unique indexes of auth_user and the fields they cover
+    unique_indexes = {
+        'auth_user_username_key': 'username',
+        'auth_user_email_lower_uniq': 'email',
+    }
+
     class Meta:
         model = User
         fields = ('username', 'email', 'password')
         extra_kwargs = {
+            'username': {'validators': [UnicodeUsernameValidator()]},
             'password': {'write_only': True},
             'email': {'required': True, 'allow_blank': False}
         }
 
+    def exists(self, field, value):
+        if not isinstance(value, str) or not value:
+            return False
+
+        if field == 'email':
+            # Served by the auth_user_email_lower_uniq index, which
+            # leaves blank emails out.
+            queryset = User.objects.alias(email_lower=Lower('email'))
+            return queryset.filter(
+                email_lower=value.lower()
+            ).exclude(email='').exists()
+        return User.objects.filter(**{field: value}).exists()
+
+    def to_internal_value(self, data):
+        try:
+            return super().to_internal_value(data)
+        except serializers.ValidationError as exc:
+            errors = exc.detail
+            if not isinstance(data, Mapping):
+                raise
+
+        for field in ('username', 'email'):
+            if field not in errors and self.exists(field, data.get(field)):
+                errors[field] = [self.error_messages[f'{field}_exists']]
+
+        ordered = {
+            name: errors[name] for name in self.fields if name in errors
+        }
+        ordered.update(errors)
+        raise serializers.ValidationError(ordered)
+
     def validate_email(self, value):
-        value = value.lower()
-        if User.objects.filter(email=value):
-            raise serializers.ValidationError(
-                'A user with this email already exist'
-            )
-        return value
+        return value.lower()
 
     def validate_password(self, value):
         validate_password(value)
         return make_password(value)
 
+    def create(self, validated_data):
+        # Inside a transaction a failed INSERT needs its own savepoint,
+        # in autocommit mode it is a transaction of its own.
+        if transaction.get_connection().in_atomic_block:
+            atomic = transaction.atomic()
+        else:
+            atomic = nullcontext()
 
-class TaskSerializer(serializers.ModelSerializer):
+        try:
+            with atomic:
+                return super().create(validated_data)
+        except IntegrityError as exc:
+            diag = getattr(exc.__cause__, 'diag', None)
+            field = self.unique_indexes.get(
+                getattr(diag, 'constraint_name', None)
+            )
+            if field is None:
+                raise
+            raise serializers.ValidationError({
+                field: [self.error_messages[f'{field}_exists']],
+            })
+
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    """TokenVerifySerializer verifying the signature once per token."""
+
+    def validate(self, attrs):
+        token = get_verified_token(UntypedToken, attrs['token'])
+
+        if is_blacklist_enabled():
+            from rest_framework_simplejwt.token_blacklist.models import (
+                BlacklistedToken,
+            )
+
+            jti = token.get(simplejwt_settings.JTI_CLAIM)
+            if BlacklistedToken.objects.filter(token__jti=jti).exists():
+                raise serializers.ValidationError('Token is blacklisted')
+
+        return {}
+
+
+class TaskBulkSerializer(TimedDataMixin, serializers.ListSerializer):
+    """Create or update a list of tasks with a single query.
+
+    For updates ``instance`` is the list of the user's tasks referenced
+    by the ``id`` of the items, and every item is validated against its
+    own task.
+    """
+    default_error_messages = {
+        'max_length': 'Ensure this list has no more than {max_length} '
+                      'items.',
+        'not_found': 'Not found.',
+        'duplicate': 'Duplicate id.',
+    }
+
+    def to_internal_value(self, data):
+        max_length = settings.TASKS_MAX_BULK_SIZE
+        if isinstance(data, list) and len(data) > max_length:
+            message = self.error_messages['max_length'].format(
+                max_length=max_length
+            )
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            }, code='max_length')
+
+        if self.instance is None:
+            return super().to_internal_value(data)
+
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(
+                input_type=type(data).__name__
+            )
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            }, code='not_a_list')
+
+        if not self.allow_empty and len(data) == 0:
+            message = self.error_messages['empty']
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [message]
+            }, code='empty')
+
+        tasks = {task.pk: task for task in self.instance}
+        seen = set()
+        ret = []
+        errors = []
+
+        for item in data:
+            pk = item.get('id') if isinstance(item, dict) else None
+            if pk is None:
+                errors.append({'id': [self.error_messages['required']]})
+                continue
+            if not isinstance(pk, int) or pk not in tasks:
+                errors.append({'id': [self.error_messages['not_found']]})
+                continue
+            if pk in seen:
+                errors.append({'id': [self.error_messages['duplicate']]})
+                continue
+            seen.add(pk)
+
+            self.child.instance = tasks[pk]
+            try:
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+            else:
+                ret.append({'id': pk, **validated})
+                errors.append({})
+            finally:
+                self.child.instance = None
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return ret
+
+    def create(self, validated_data):
+        return Task.objects.bulk_create(
+            Task(**attrs) for attrs in validated_data
+        )
+
+    def update(self, instance, validated_data):
+        tasks = {task.pk: task for task in instance}
+        updated = []
+        fields = set()
+
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            task = tasks[attrs.pop('id')]
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            task.version = TransactionId()
+            fields.update(attrs)
+            updated.append(task)
+
+        if fields:
+            Task.objects.bulk_update(updated, [*fields, 'version'])
+        return updated
+
+
+class TaskSerializer(TimedDataMixin, serializers.ModelSerializer):
     class Meta:
         model = Task
+        list_serializer_class = TaskBulkSerializer
         fields = (
             'id',
             'title',
@@ -67,7 +279,67 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskStatusesSerializer(serializers.Serializer):
+def get_datetime_formatter():
+    """Return a function formatting datetimes as DateTimeField does.
+
+    The output format and the current time zone are looked up once
+    instead of once per value.
+    """
+    field = serializers.DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    field_timezone = field.default_timezone()
+
+    if (output_format is None or output_format.lower() != ISO_8601
+            or field_timezone is None):
+        return field.to_representation
+
+    def to_representation(value):
+        if value is None:
+            return None
+
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return to_representation
+
+
+class TaskValuesSerializer:
+    """Read-only serializer for lists of tasks.
+
+    Works on ``Task.objects.values(*TaskValuesSerializer.fields)`` rows
+    and gives the same output as ``TaskSerializer(many=True)`` without
+    building a model instance and an OrderedDict per task.
+    """
+    fields = TaskSerializer.Meta.fields
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        to_representation = get_datetime_formatter()
+
+        for row in self.rows:
+            row['start_date'] = to_representation(row['start_date'])
+            row['end_date'] = to_representation(row['end_date'])
+            yield row
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return list(self)
+
+
+class TaskStatusesSerializer(TimedDataMixin, serializers.Serializer):
     date = serializers.DateTimeField()
     completed = serializers.BooleanField()
     not_completed = serializers.BooleanField()
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+
+class TaskCompleteSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    completed = serializers.BooleanField(default=True)
@@ -0,0 +1,108 @@
+"""Delta sync of tasks: what changed since a sync token.
+
+Every write to a task sets ``Task.version`` and every deletion leaves a
+``TaskTombstone``, both stamped with the id of the writing transaction
+and indexed by (user, version), so a sync reads only the rows changed
+since the token.
+
+Transaction ids are assigned when transactions start, not when they
+commit, so the token is not the greatest version read: it is the
+``xmin`` of the snapshot of the sync, below which every transaction has
+ended. Changes committed after the snapshot, however late, have a
+version at least as great and are read by the next sync. Changes of
+transactions above ``xmin`` already seen are sent again; clients apply
+changes by task id, so repeats are harmless.
+"""
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Task, TaskTombstone
+from .serializers import TaskValuesSerializer
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Sync token has expired, fetch all tasks again.'
+    default_code = 'sync_token_expired'
+
+
+def encode_token(version, moment):
+    token = f'{version}:{moment.isoformat()}'.encode()
+    return urlsafe_b64encode(token).decode().rstrip('=')
+
+
+def decode_token(token):
+    """Return the version and the time of issue of a sync token."""
+    try:
+        token = urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        version, _, moment = token.decode().partition(':')
+        version = int(version)
+        moment = parse_datetime(moment)
+    except (binascii.Error, TypeError, ValueError):
+        moment = None
+
+    if moment is None or timezone.is_naive(moment):
+        raise ValidationError({'since': 'Invalid token.'})
+    return version, moment
+
+
+def get_snapshot_xmin(using):
+    """Return the least id of the transactions running for ``using``."""
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        return cursor.fetchone()[0]
+
+
+def record_deletions(user_id, task_ids):
+    """Leave tombstones for the deleted tasks of the user."""
+    TaskTombstone.objects.bulk_create(
+        TaskTombstone(user_id=user_id, task_id=task_id)
+        for task_id in task_ids
+    )
+
+
+def prune_tombstones():
+    """Delete tombstones older than any token still accepted."""
+    retention = timedelta(days=settings.TASKS_SYNC_RETENTION)
+    return TaskTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - retention,
+    ).delete()[0]
+
+
+def get_changes(user_id, token=None):
+    """Return tasks changed and ids of tasks deleted since ``token``.
+
+    Without a token every task is returned as changed.
+    """
+    now = timezone.now()
+    tasks = Task.objects.filter(user_id=user_id)
+    deleted = []
+    # Before reading the changes: their snapshot can only be later.
+    version = get_snapshot_xmin(tasks.db)
+
+    if token is not None:
+        since, issued = decode_token(token)
+        if issued < now - timedelta(days=settings.TASKS_SYNC_RETENTION):
+            raise SyncTokenExpired()
+
+        tasks = tasks.filter(version__gte=since)
+        deleted = TaskTombstone.objects.filter(
+            user_id=user_id, version__gte=since,
+        ).order_by('version', 'id').values_list('task_id', flat=True)
+
+    tasks = tasks.order_by('version', 'id').values(
+        *TaskValuesSerializer.fields
+    )
+    return {
+        'changed': TaskValuesSerializer(tasks).data,
+        'deleted': list(deleted),
+        'next': encode_token(version, now),
+    }
@@ -0,0 +1,108 @@
+"""Timing of the database work, serialization and rendering of requests.
+
+api.middleware.RequestTimingMiddleware times a sample of the requests
+with a ``RequestTiming``, current for the request in a context
+variable: async views run their database work in threads through
+``sync_to_async``, which carries it over. The queries of the sampled
+requests go through ``record_query``, an execute wrapper of the
+connections (see ``connection.execute_wrapper()``), and blocks of code in
+``timed(name)`` add up under ``name``. Outside of sampled requests both
+only look up the context variable.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        # name -> seconds
+        self.durations = {}
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self):
+        """Return the value of the ``Server-Timing`` header, in ms."""
+        metrics = [
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+            *(
+                f'{name};dur={seconds * 1000:.2f}'
+                for name, seconds in self.durations.items()
+            ),
+            f'total;dur={self.total * 1000:.2f}',
+        ]
+        return ', '.join(metrics)
+
+
+def get_timing():
+    """Return the timing of the current request, None if not sampled."""
+    return _current.get()
+
+
+@contextmanager
+def request_timing():
+    """Time the request of the block."""
+    timing = RequestTiming()
+    for connection in connections.all():
+        add_query_recorder(connection=connection)
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Add the time of the block outside of the database under ``name``.
+
+    The queries of lazy querysets run while serializing, for instance,
+    and are only counted as database time.
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+
+    start, db = time.perf_counter(), timing.db
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start - (timing.db - db))
+
+
+def record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db += time.perf_counter() - start
+
+
+def add_query_recorder(sender=None, connection=None, **kwargs):
+    """Make ``record_query`` an execute wrapper of ``connection``.
+
+    Connected to ``connection_created``, for the connections of every
+    thread.
+    """
+    if record_query not in connection.execute_wrappers:
+        # First, as the outermost wrapper: execute_wrapper() blocks pop
+        # the last one on exit, which may be running when it connects.
+        connection.execute_wrappers.insert(0, record_query)
@@ -0,0 +1,96 @@
+"""Cache of verified JSON web tokens.
+
+Verifying a token means decoding it and checking its HMAC signature and
+claims. Clients send the same access token with every request for its
+whole lifetime, so verified tokens are kept in a bounded in-process LRU
+keyed by a hash of the raw token, until the token expires.
+
+Blacklist checks are never cached: they run on every use of a token.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+
+def is_blacklist_enabled():
+    return (
+        api_settings.BLACKLIST_AFTER_ROTATION
+        and 'rest_framework_simplejwt.token_blacklist'
+        in settings.INSTALLED_APPS
+    )
+
+
+class VerifiedTokenCache:
+    """LRU of verified tokens with hit/miss counters."""
+
+    def __init__(self):
+        self.tokens = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, token_class, raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return token_class, hashlib.sha256(raw_token).digest()
+
+    def get(self, token_class, raw_token):
+        key = self.get_key(token_class, raw_token)
+        with self.lock:
+            token, expires_at = self.tokens.get(key, (None, 0))
+            if expires_at > time.time():
+                self.tokens.move_to_end(key)
+                self.hits += 1
+                return token
+
+            self.tokens.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, token_class, raw_token, token):
+        max_size = settings.JWT_TOKEN_CACHE_SIZE
+        expires_at = token.payload.get('exp')
+        if not max_size or expires_at is None:
+            return
+
+        key = self.get_key(token_class, raw_token)
+        with self.lock:
+            self.tokens[key] = (token, expires_at)
+            self.tokens.move_to_end(key)
+            while len(self.tokens) > max_size:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.tokens),
+                'max_size': settings.JWT_TOKEN_CACHE_SIZE,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def get_verified_token(token_class, raw_token):
+    """Return ``token_class(raw_token)``, verified once per token.
+
+    Raises ``TokenError`` like the token class does.
+    """
+    token = verified_tokens.get(token_class, raw_token)
+    if token is None:
+        token = token_class(raw_token)
+        verified_tokens.set(token_class, raw_token, token)
+    elif is_blacklist_enabled() and hasattr(token, 'check_blacklist'):
+        token.check_blacklist()
+    return token
@@ -2,12 +2,14 @@ from django.urls import include
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     RegisterViewSet,
     TaskViewSet,
     DecoratedToSwaggerTokenRefreshView,
     DecoratedToSwaggerTokenObtainPairView,
-    DecoratedToSwaggerTokenVerifyView
+    DecoratedToSwaggerTokenVerifyView,
+    TokenCacheStatsView,
 )
 
 
@@ -24,4 +26,12 @@ urlpatterns = [
          name='token_refresh'),
     path('v1/verify-token/', DecoratedToSwaggerTokenVerifyView.as_view(),
          name='token_verify'),
+    path('v1/token-cache-stats/', TokenCacheStatsView.as_view(),
+         name='token_cache_stats'),
+    path('v1/async/tasks/', async_views.task_list,
+         name='async-task-list'),
+    path('v1/async/tasks/statuses/', async_views.task_statuses,
+         name='async-task-statuses'),
+    path('v1/async/tasks/<int:pk>/', async_views.task_detail,
+         name='async-task-detail'),
 ]
@@ -0,0 +1,159 @@
+"""Benchmark the admin changelist of tasks on a large table.
+
+``--tasks`` tasks of ``--users`` users spread over five years are
+inserted with SQL, then changelist pages (first page, date hierarchy,
+filter, search, deep page) are rendered with the admin options used
+before api.admin.TaskAdmin was made for large tables and with the
+current ones. Pages taking longer than ``--timeout`` seconds are
+cancelled.
+
+    python -m benchmarks.bench_admin [--tasks 1000000] [--users 10000]
+"""
+import argparse
+import time
+
+from benchmarks.utils import print_table, setup_django, test_database
+
+URLS = [
+    ('first page', {}),
+    ('year', {'start_date__year': '2020'}),
+    ('month', {'start_date__year': '2020', 'start_date__month': '3'}),
+    ('completed', {'completed__exact': '1'}),
+    ('search user', {'q': 'user5'}),
+    ('page 50', {'p': '50'}),
+]
+
+
+def get_legacy_admin():
+    """Return the TaskAdmin options used before it was made scalable."""
+    from django.core.paginator import Paginator
+
+    from api.admin import TaskAdmin
+
+    class LegacyTaskAdmin(TaskAdmin):
+        list_editable = (
+            'title',
+            'description',
+            'start_date',
+            'end_date',
+            'completed',
+            'user',
+        )
+        list_select_related = False
+        list_filter = ('title', 'description', 'user', 'completed')
+        date_hierarchy = None
+        ordering = None
+        sortable_by = None
+        search_fields = (
+            'id',
+            'title',
+            'description',
+            'start_date',
+            'end_date',
+            'completed',
+            'user__username',
+            'user__id',
+        )
+        search_help_text = None
+        autocomplete_fields = ()
+        paginator = Paginator
+        show_full_result_count = True
+
+        def get_queryset(self, request):
+            return super(TaskAdmin, self).get_queryset(request)
+
+        def get_search_results(self, request, queryset, search_term):
+            return super(TaskAdmin, self).get_search_results(
+                request, queryset, search_term
+            )
+
+    return LegacyTaskAdmin
+
+
+def insert_tasks(connection, tasks, users):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO auth_user (password, is_superuser, username, "
+            "first_name, last_name, email, is_staff, is_active, "
+            "date_joined) "
+            "SELECT '', false, 'user' || i, '', '', 'user' || i || '@b.io', "
+            "false, true, now() FROM generate_series(1, %s) i",
+            [users],
+        )
+        cursor.execute(
+            "INSERT INTO api_task (title, description, start_date, "
+            "end_date, completed, version, user_id) "
+            "SELECT 'task ' || i %% 1000, 'benchmark', "
+            "timestamptz '2018-01-01' + (i %% 1826) * interval '1 day' "
+            "+ (i %% 1440) * interval '1 minute', "
+            "timestamptz '2018-01-02' + (i %% 1826) * interval '1 day', "
+            "i %% 3 = 0, txid_current(), "
+            "(SELECT min(id) FROM auth_user) + i %% %s "
+            "FROM generate_series(1, %s) i",
+            [users, tasks],
+        )
+        cursor.execute('VACUUM ANALYZE api_task')
+        cursor.execute('VACUUM ANALYZE auth_user')
+
+
+def time_page(connection, model_admin, request, timeout):
+    """Return the time to render the changelist in ms, None on timeout."""
+    from django.db.utils import OperationalError
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SET statement_timeout = '{timeout}s'")
+    start = time.perf_counter()
+    try:
+        response = model_admin.changelist_view(request)
+        response.render()
+    except OperationalError:
+        return None
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('RESET statement_timeout')
+    assert response.status_code == 200, response
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--timeout', type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib import admin
+    from django.test import RequestFactory
+
+    from api.admin import TaskAdmin
+    from api.models import Task, User
+
+    with test_database() as connection:
+        insert_tasks(connection, args.tasks, args.users)
+        superuser = User.objects.create_superuser('admin', 'admin@b.io')
+        admins = [
+            ('before', get_legacy_admin()(Task, admin.site)),
+            ('after', TaskAdmin(Task, admin.site)),
+        ]
+
+        rows = []
+        for name, params in URLS:
+            row = [name]
+            for _, model_admin in admins:
+                request = RequestFactory().get('/admin/api/task/', params)
+                request.user = superuser
+                elapsed = time_page(
+                    connection, model_admin, request, args.timeout
+                )
+                row.append(
+                    f'{elapsed:.0f}' if elapsed is not None
+                    else f'>{args.timeout * 1000}'
+                )
+            rows.append(row)
+
+    print_table(('page', 'before ms', 'after ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
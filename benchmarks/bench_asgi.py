@@ -0,0 +1,103 @@
+"""Load test the sync API under WSGI against the async API under ASGI.
+
+One worker process of each server (gunicorn gthread for WSGI, uvicorn
+for ASGI) serves GET requests for a user's tasks of one month from
+``--connections`` concurrent keep-alive connections for ``--duration``
+seconds. Responses are not cached (TASKS_CACHE_TIMEOUT=0).
+
+    python -m benchmarks.bench_asgi [--connections 1000] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    http_load,
+    print_table,
+    raise_open_files_limit,
+    setup_django,
+    summarize_load,
+    test_database,
+    wait_for_port,
+)
+
+PATHS = {
+    'wsgi': '/api/v1/tasks/?year=2020&month=3',
+    'asgi': '/api/v1/async/tasks/?year=2020&month=3',
+}
+
+
+def server_command(interface, port, threads):
+    if interface == 'wsgi':
+        return [
+            sys.executable, '-m', 'gunicorn', 'ToDoCalendar.wsgi',
+            '--bind', f'127.0.0.1:{port}', '--workers', '1',
+            '--worker-class', 'gthread', '--threads', str(threads),
+            '--log-level', 'warning',
+        ]
+    return [
+        sys.executable, '-m', 'uvicorn', 'ToDoCalendar.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', '1',
+        '--log-level', 'warning', '--no-access-log',
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--threads', type=int, default=32,
+                        help='threads of the gthread WSGI worker')
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    raise_open_files_limit(2 * args.connections + 256)
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database() as connection:
+        user = create_user_with_tasks('bench', args.tasks)
+        token = str(AccessToken.for_user(user))
+        env = {
+            **os.environ,
+            'POSTGRES_DB': connection.settings_dict['NAME'],
+            'TASKS_CACHE_TIMEOUT': '0',
+        }
+        # The servers open their own connections to the test database.
+        connection.close()
+
+        rows = []
+        for interface, path in PATHS.items():
+            server = subprocess.Popen(
+                server_command(interface, args.port, args.threads),
+                # As set by manage.py serve; ToDoCalendar.asgi closes the
+                # connections after each request either way.
+                env={**env, 'SERVER_INTERFACE': interface},
+            )
+            try:
+                wait_for_port(args.port)
+                latencies, errors = asyncio.run(http_load(
+                    args.port, path, token, args.connections, args.duration
+                ))
+            finally:
+                server.terminate()
+                server.wait()
+
+            rows.append((
+                interface,
+                *summarize_load(latencies, errors, args.duration),
+            ))
+
+        print_table(
+            ('server', 'requests', 'req/s', 'p50 ms', 'p99 ms', 'errors'),
+            rows,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark per-request latency with and without persistent connections.
+
+One WSGI worker (``manage.py serve --workers 1``) serves GET requests for
+a user's tasks of one month to a single client, one request at a time,
+for each database connection configuration. Responses are not cached
+(TASKS_CACHE_TIMEOUT=0).
+
+    python -m benchmarks.bench_connections [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    http_load,
+    print_table,
+    setup_django,
+    summarize_load,
+    test_database,
+    wait_for_port,
+)
+
+PATH = '/api/v1/tasks/?year=2020&month=3'
+
+CONFIGURATIONS = {
+    'new connection per request': {
+        'POSTGRES_CONN_MAX_AGE': '0',
+    },
+    'persistent': {
+        'POSTGRES_CONN_MAX_AGE': '60',
+        'POSTGRES_CONN_HEALTH_CHECKS': 'false',
+    },
+    'persistent, health checks': {
+        'POSTGRES_CONN_MAX_AGE': '60',
+        'POSTGRES_CONN_HEALTH_CHECKS': 'true',
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database() as connection:
+        user = create_user_with_tasks('bench', args.tasks)
+        token = str(AccessToken.for_user(user))
+        env = {
+            **os.environ,
+            'POSTGRES_DB': connection.settings_dict['NAME'],
+            'TASKS_CACHE_TIMEOUT': '0',
+        }
+        # The server opens its own connections to the test database.
+        connection.close()
+
+        command = [
+            sys.executable, 'manage.py', 'serve', '--workers', '1',
+            '--bind', f'127.0.0.1:{args.port}',
+        ]
+        rows = []
+        for name, configuration in CONFIGURATIONS.items():
+            server = subprocess.Popen(
+                command, env={**env, **configuration},
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for_port(args.port)
+                latencies, errors = asyncio.run(http_load(
+                    args.port, PATH, token, 1, args.duration
+                ))
+            finally:
+                server.terminate()
+                server.wait()
+
+            rows.append((
+                name,
+                *summarize_load(latencies, errors, args.duration),
+            ))
+
+        print_table(
+            ('connections', 'requests', 'req/s', 'p50 ms', 'p99 ms',
+             'errors'),
+            rows,
+        )
+
+
+if __name__ == '__main__':
+    main()
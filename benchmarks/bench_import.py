@@ -0,0 +1,124 @@
+"""Measure the boot time of a worker with ``python -X importtime``.
+
+A fresh interpreter does what a worker does before its first request:
+set up Django, create the WSGI application and load ROOT_URLCONF, with
+the API documentation enabled and disabled (API_DOCS_ENABLED). The wall
+clock time of the boot and the import time reported by ``-X importtime``
+are the medians of ``--repeat`` runs, followed by the packages taking
+the most import time.
+
+    python -m benchmarks.bench_import [--repeat 5] [--top 10]
+        [--max-boot-ms MS]
+
+With ``--max-boot-ms`` the benchmark fails when a boot takes longer, to
+catch import time regressions in CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import print_table
+
+BOOT = '''
+import django
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+get_wsgi_application()
+get_resolver().url_patterns
+'''
+
+
+def parse_importtime(stderr):
+    """Return {module: (self us, cumulative us)} of ``-X importtime``."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.rstrip()] = int(self_us), int(cumulative_us)
+    return modules
+
+
+def boot(docs_enabled):
+    """Return the boot time in seconds and the imports of one boot."""
+    env = {
+        **os.environ,
+        'API_DOCS_ENABLED': 'true' if docs_enabled else 'false',
+        'DJANGO_SETTINGS_MODULE': 'ToDoCalendar.settings',
+    }
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return time.perf_counter() - start, parse_importtime(result.stderr)
+
+
+def get_packages(modules):
+    """Return {top-level package: import time in us} of the imports."""
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-boot-ms', type=float)
+    args = parser.parse_args()
+
+    results = {}
+    for docs_enabled in (True, False):
+        boots = [boot(docs_enabled) for _ in range(args.repeat)]
+        results[docs_enabled] = (
+            statistics.median(seconds for seconds, _ in boots) * 1000,
+            statistics.median(
+                sum(self_us for self_us, _ in modules.values())
+                for _, modules in boots
+            ) / 1000,
+            boots[-1][1],
+        )
+
+    print_table(
+        ('API docs', 'boot ms', 'import ms', 'modules'),
+        [
+            ('enabled' if docs_enabled else 'disabled',
+             f'{boot_ms:.0f}', f'{import_ms:.0f}', len(modules))
+            for docs_enabled, (boot_ms, import_ms, modules)
+            in results.items()
+        ],
+    )
+
+    print()
+    enabled = get_packages(results[True][2])
+    disabled = get_packages(results[False][2])
+    top = sorted(enabled, key=enabled.get, reverse=True)[:args.top]
+    print_table(
+        ('package', 'docs enabled ms', 'docs disabled ms'),
+        [
+            (package,
+             f'{enabled[package] / 1000:.1f}',
+             f'{disabled[package] / 1000:.1f}'
+             if package in disabled else '-')
+            for package in top
+        ],
+    )
+
+    if args.max_boot_ms is not None:
+        slowest = max(boot_ms for boot_ms, _, _ in results.values())
+        if slowest > args.max_boot_ms:
+            sys.exit(
+                f'Boot took {slowest:.0f} ms, more than the '
+                f'{args.max_boot_ms:.0f} ms allowed.'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark the middleware of API requests, one middleware at a time.
+
+A marker middleware between every two middleware records when the
+request reaches it and when the response leaves it, so the time spent in
+each middleware itself (request and response side) is known. A user's
+tasks of one month are requested from the response cache, as with
+repeated GET /api/v1/tasks/ requests, with the middleware used before
+NonAPIMiddleware and with the one of settings.
+
+    python -m benchmarks.bench_middleware [--repeat 2000]
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+URL = '/api/v1/tasks/?year=2020&month=3'
+
+ALL_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# (times the request reached, times the response left) each marker
+marks = []
+
+
+def make_marker(index):
+    class Marker:
+        def __init__(self, get_response):
+            self.get_response = get_response
+
+        def __call__(self, request):
+            marks[index][0].append(time.perf_counter())
+            response = self.get_response(request)
+            marks[index][1].append(time.perf_counter())
+            return response
+
+    Marker.__name__ = Marker.__qualname__ = f'Marker{index}'
+    globals()[Marker.__name__] = Marker
+    return f'{__name__}.{Marker.__name__}'
+
+
+def with_markers(middleware):
+    """Interleave markers with the middleware."""
+    stack = [make_marker(0)]
+    for index, path in enumerate(middleware, 1):
+        stack += [path, make_marker(index)]
+    return stack
+
+
+def time_middleware(middleware, headers, repeat):
+    """Return the median time spent in each middleware in microseconds."""
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    marks[:] = [([], []) for _ in range(len(middleware) + 1)]
+    with override_settings(MIDDLEWARE=with_markers(middleware)):
+        # The client loads the middleware on its first request.
+        client = Client()
+        # Warm up, and fill the response cache.
+        for _ in range(10):
+            response = client.get(URL, **headers)
+            assert response.status_code == 200, response
+        for requests, responses in marks:
+            requests.clear()
+            responses.clear()
+
+        for _ in range(repeat):
+            client.get(URL, **headers)
+
+    timings = {}
+    for index, path in enumerate(middleware):
+        before, after = marks[index], marks[index + 1]
+        timings[path] = statistics.median(
+            (after[0][n] - before[0][n]) + (before[1][n] - after[1][n])
+            for n in range(repeat)
+        ) * 10 ** 6
+    total = statistics.median(
+        marks[0][1][n] - marks[0][0][n] for n in range(repeat)
+    ) * 10 ** 6
+    return timings, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database():
+        user = create_user_with_tasks('bench', 100)
+        headers = {
+            'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'
+        }
+        before, before_total = time_middleware(
+            ALL_MIDDLEWARE, headers, args.repeat
+        )
+        after, after_total = time_middleware(
+            settings.MIDDLEWARE, headers, args.repeat
+        )
+
+    rows = []
+    for path in dict.fromkeys([*ALL_MIDDLEWARE, *settings.MIDDLEWARE]):
+        name = path.rsplit('.', 1)[-1]
+        rows.append((
+            name,
+            f'{before[path]:.1f}' if path in before else '-',
+            f'{after[path]:.1f}' if path in after else '-',
+        ))
+    rows.append(('request', f'{before_total:.1f}', f'{after_total:.1f}'))
+    print_table(('middleware', 'before us', 'after us'), rows)
+
+
+if __name__ == '__main__':
+    main()
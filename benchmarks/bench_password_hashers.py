@@ -0,0 +1,72 @@
+"""Benchmark POST /login/ for each password hasher configuration.
+
+Logins run one at a time, so logins/sec is the rate of a single core.
+Costs come from the PASSWORD_* settings (environment variables).
+
+    python -m benchmarks.bench_password_hashers [--hashers argon2 pbkdf2]
+"""
+import argparse
+
+from benchmarks.utils import measure, print_table, setup_django, test_database
+
+HASHERS = {
+    'argon2': 'api.hashers.Argon2PasswordHasher',
+    'scrypt': 'api.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'api.hashers.PBKDF2PasswordHasher',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--hashers', nargs='+', choices=HASHERS, default=list(HASHERS)
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.hashers import make_password
+    from django.test.utils import override_settings
+    from rest_framework.test import APIRequestFactory
+
+    from api.models import User
+    from api.views import DecoratedToSwaggerTokenObtainPairView
+
+    factory = APIRequestFactory()
+    view = DecoratedToSwaggerTokenObtainPairView.as_view()
+    password = '123qeqweQ_4'
+
+    def login(username):
+        request = factory.post(
+            '/api/v1/login/', {'username': username, 'password': password}
+        )
+        response = view(request)
+        assert response.status_code == 200, response.data
+
+    with test_database():
+        rows = []
+        for name in args.hashers:
+            hashers = [HASHERS[name]] + [
+                path for other, path in HASHERS.items() if other != name
+            ]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                hash_ms = measure(lambda: make_password(password), 5)
+                User.objects.create(
+                    username=name, password=make_password(password)
+                )
+                login_ms = measure(lambda: login(name), args.repeat)
+
+            rows.append((
+                name,
+                f'{hash_ms:.1f}',
+                f'{login_ms:.1f}',
+                f'{1000 / login_ms:.1f}',
+            ))
+
+        print_table(
+            ('hasher', 'hash ms', 'login ms', 'logins/sec per core'), rows
+        )
+
+
+if __name__ == '__main__':
+    main()
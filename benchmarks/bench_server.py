@@ -0,0 +1,96 @@
+"""Load test ``manage.py serve`` against ``manage.py runserver``.
+
+Each server serves GET requests for a user's tasks of one month from
+``--connections`` concurrent keep-alive connections for ``--duration``
+seconds: runserver (one process, a thread per connection), serve with
+WSGI workers and serve with ASGI workers, both with the default number
+of workers for the CPUs of the machine. Responses are not cached
+(TASKS_CACHE_TIMEOUT=0).
+
+    python -m benchmarks.bench_server [--connections 64] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    http_load,
+    print_table,
+    raise_open_files_limit,
+    setup_django,
+    summarize_load,
+    test_database,
+    wait_for_port,
+)
+
+SYNC_PATH = '/api/v1/tasks/?year=2020&month=3'
+ASYNC_PATH = '/api/v1/async/tasks/?year=2020&month=3'
+
+
+def get_servers(port):
+    """Return (name, command, path) of each server to compare."""
+    manage = [sys.executable, 'manage.py']
+    serve = [*manage, 'serve', '--bind', f'127.0.0.1:{port}']
+    return [
+        ('runserver', [*manage, 'runserver', '--noreload', str(port)],
+         SYNC_PATH),
+        ('serve wsgi', [*serve, '--interface', 'wsgi'], SYNC_PATH),
+        ('serve asgi', [*serve, '--interface', 'asgi'], ASYNC_PATH),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    raise_open_files_limit(2 * args.connections + 256)
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    with test_database() as connection:
+        user = create_user_with_tasks('bench', args.tasks)
+        token = str(AccessToken.for_user(user))
+        env = {
+            **os.environ,
+            'POSTGRES_DB': connection.settings_dict['NAME'],
+            'TASKS_CACHE_TIMEOUT': '0',
+        }
+        # The servers open their own connections to the test database.
+        connection.close()
+
+        rows = []
+        for name, command, path in get_servers(args.port):
+            server = subprocess.Popen(
+                command, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for_port(args.port)
+                latencies, errors = asyncio.run(http_load(
+                    args.port, path, token, args.connections, args.duration
+                ))
+            finally:
+                server.terminate()
+                server.wait()
+
+            rows.append((
+                name,
+                *summarize_load(latencies, errors, args.duration),
+            ))
+
+        print_table(
+            ('server', 'requests', 'req/s', 'p50 ms', 'p99 ms', 'errors'),
+            rows,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark GET /tasks/statuses/: Python day loop vs database rollup.
+
+    python -m benchmarks.bench_statuses [--sizes 1000 10000 100000]
+"""
+import argparse
+from datetime import datetime
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    measure,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+
+def python_statuses(queryset):
+    """The previous implementation, kept here as the baseline."""
+    data = {}
+    for task in queryset:
+        date = task.start_date
+        key = datetime(year=date.year, month=date.month, day=date.day)
+        status = data.setdefault(
+            key, {'completed': False, 'not_completed': False}
+        )
+        if task.completed:
+            status['completed'] = True
+        else:
+            status['not_completed'] = True
+
+    return sorted(
+        ({'date': date, **status} for date, status in data.items()),
+        key=lambda x: x['date'],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.models import Task
+
+    with test_database():
+        rows = []
+        for size in args.sizes:
+            user = create_user_with_tasks(f'user{size}', size)
+            queryset = Task.objects.filter(user=user)
+
+            python_ms = measure(
+                lambda: python_statuses(queryset.all()), args.repeat
+            )
+            database_ms = measure(
+                lambda: list(queryset.statuses()), args.repeat
+            )
+            rows.append((
+                size,
+                f'{python_ms:.1f}',
+                f'{database_ms:.1f}',
+                f'{python_ms / database_ms:.1f}x',
+            ))
+
+        print_table(('tasks', 'python ms', 'database ms', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark task list serialization: TaskSerializer vs TaskValuesSerializer.
+
+Both paths go from a queryset to the rendered JSON bytes.
+
+    python -m benchmarks.bench_task_serializer [--sizes 1000 10000 100000]
+"""
+import argparse
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    measure,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.models import Task
+    from api.serializers import TaskSerializer, TaskValuesSerializer
+
+    renderer = JSONRenderer()
+
+    def model_serializer(queryset):
+        return renderer.render(TaskSerializer(queryset, many=True).data)
+
+    def values_serializer(queryset):
+        rows = queryset.values(*TaskValuesSerializer.fields)
+        return renderer.render(TaskValuesSerializer(rows).data)
+
+    with test_database():
+        rows = []
+        for size in args.sizes:
+            user = create_user_with_tasks(f'user{size}', size)
+            queryset = Task.objects.filter(user=user).order_by('start_date')
+            assert model_serializer(queryset) == values_serializer(queryset)
+
+            model_ms = measure(
+                lambda: model_serializer(queryset.all()), args.repeat
+            )
+            values_ms = measure(
+                lambda: values_serializer(queryset.all()), args.repeat
+            )
+            rows.append((
+                size,
+                f'{model_ms:.1f}',
+                f'{values_ms:.1f}',
+                f'{model_ms / values_ms:.1f}x',
+            ))
+
+        print_table(
+            ('tasks', 'TaskSerializer ms', 'values ms', 'speedup'), rows
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark peak memory of GET /tasks/ with and without ?stream=1.
+
+    python -m benchmarks.bench_task_stream [--sizes 1000 10000 100000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.utils import (
+    create_user_with_tasks,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+
+def profile(func):
+    """Return (peak MiB, seconds) of ``func``."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[1000, 10000, 100000]
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from api.views import TaskViewSet
+
+    factory = APIRequestFactory()
+    view = TaskViewSet.as_view({'get': 'list'})
+
+    def get(user, params):
+        request = factory.get('/api/v1/tasks/', params)
+        force_authenticate(request, user=user)
+        return view(request)
+
+    def buffered(user):
+        len(get(user, {}).render().content)
+
+    def streamed(user):
+        for _ in get(user, {'stream': 1}).streaming_content:
+            pass
+
+    with test_database():
+        rows = []
+        for size in args.sizes:
+            user = create_user_with_tasks(f'user{size}', size)
+            buffered_mib, buffered_s = profile(lambda: buffered(user))
+            streamed_mib, streamed_s = profile(lambda: streamed(user))
+            rows.append((
+                size,
+                f'{buffered_mib:.1f}',
+                f'{streamed_mib:.1f}',
+                f'{buffered_s:.2f}',
+                f'{streamed_s:.2f}',
+            ))
+
+        print_table(
+            ('tasks', 'buffered MiB', 'streamed MiB', 'buffered s',
+             'streamed s'),
+            rows,
+        )
+
+
+if __name__ == '__main__':
+    main()
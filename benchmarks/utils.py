@@ -0,0 +1,183 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks are plain scripts run from the project root, e.g.::
+
+    python -m benchmarks.bench_statuses
+
+They create a throwaway test database next to the configured one
+(``test_<POSTGRES_DB>``), so the development data is never touched.
+"""
+import asyncio
+import os
+import resource
+import socket
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ToDoCalendar.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a test database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def create_user_with_tasks(username, count, days=365, batch_size=5000):
+    """Create a user owning ``count`` tasks spread over ``days`` days."""
+    from api.models import Task, User
+
+    user = User.objects.create(username=username, email=f'{username}@b.io')
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    tasks = (
+        Task(
+            title=f'task {i}',
+            description='benchmark',
+            start_date=start + timedelta(days=i % days, minutes=i % 1440),
+            end_date=start + timedelta(days=i % days + 1),
+            completed=i % 3 == 0,
+            user=user,
+        )
+        for i in range(count)
+    )
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) == batch_size:
+            Task.objects.bulk_create(batch)
+            batch = []
+    Task.objects.bulk_create(batch)
+    return user
+
+
+def measure(func, repeat=5):
+    """Run ``func`` ``repeat`` times and return the median in ms."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(value)) for value in column)
+        for column in zip(header, *rows)
+    ]
+    for row in (header, *rows):
+        print('  '.join(
+            str(value).rjust(width) for value, width in zip(row, widths)
+        ))
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server did not start on port {port}')
+
+
+async def connection_loop(port, request, deadline, latencies, errors):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', port
+                )
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b'\r\n\r\n')
+            status_line, *headers = head.decode('latin1').split('\r\n')
+            length = 0
+            keep_alive = True
+            for header in headers:
+                name, _, value = header.partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+                elif name.lower() == 'connection':
+                    keep_alive = value.strip().lower() != 'close'
+            await reader.readexactly(length)
+
+            if status_line.split()[1] == '200':
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(status_line)
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError) as exc:
+            errors.append(repr(exc))
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+
+    if writer is not None:
+        writer.close()
+
+
+async def http_load(port, path, token, connections, duration):
+    """GET ``path`` from ``connections`` keep-alive connections.
+
+    Returns the latencies of successful responses and the errors.
+    """
+    request = (
+        f'GET {path} HTTP/1.1\r\n'
+        f'Host: 127.0.0.1:{port}\r\n'
+        f'Authorization: Bearer {token}\r\n'
+        f'\r\n'
+    ).encode()
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        connection_loop(port, request, deadline, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors
+
+
+def summarize_load(latencies, errors, duration):
+    """Return requests, req/s, p50 ms, p99 ms and errors of a load."""
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    return (
+        len(latencies),
+        f'{len(latencies) / duration:.0f}',
+        f'{statistics.median(latencies or [0]) * 1000:.0f}',
+        f'{p99 * 1000:.0f}',
+        len(errors),
+    )
+
+
+def raise_open_files_limit(wanted):
+    """Allow ``wanted`` open files, for many concurrent connections."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
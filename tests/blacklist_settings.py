@@ -0,0 +1,17 @@
+"""Settings with the token blacklist installed, see test_token_blacklist.
+
+The blacklist models are abstract unless the app is installed when
+rest_framework_simplejwt.tokens is first imported, so it cannot be
+installed with override_settings.
+"""
+from ToDoCalendar.settings import *  # noqa: F401,F403
+from ToDoCalendar.settings import DATABASES, INSTALLED_APPS, SIMPLE_JWT
+
+INSTALLED_APPS = [
+    *INSTALLED_APPS, 'rest_framework_simplejwt.token_blacklist',
+]
+SIMPLE_JWT = {**SIMPLE_JWT, 'BLACKLIST_AFTER_ROTATION': True}
+# Not the database of the tests running these ones.
+DATABASES['default']['TEST'] = {
+    'NAME': f'test_{DATABASES["default"]["NAME"]}_blacklist',
+}
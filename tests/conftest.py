@@ -1,10 +1,25 @@
 import datetime
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
 from django.urls import reverse
 
+from api.authentication import clear_active_users
 from api.models import User, Task
 from api.serializers import RegisterSerializer
+from api.tokens import verified_tokens
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches."""
+    cache.clear()
+    clear_active_users()
+    verified_tokens.clear()
 
 
 @pytest.fixture
@@ -78,6 +93,20 @@ def set_of_authenticated_accounts_data(client, set_of_accounts_data):
     }
 
 
+@pytest.fixture
+def account(set_of_authenticated_accounts_data):
+    """First authenticated account, with its ``auth_header``."""
+    account = set_of_authenticated_accounts_data['authenticated_account1']
+    account['auth_header'] = f'Bearer {account["access-token"]}'
+    return account
+
+
+@pytest.fixture
+def auth_header(account):
+    """Authorization header of the first authenticated account."""
+    return account['auth_header']
+
+
 @pytest.fixture
 def set_of_tasks_data(client, set_of_accounts_data):
     """Create set of authenticated accounts."""
@@ -132,3 +161,53 @@ def convert_date_class_to_iso_format():
         return date.strftime("%Y-%m-%dT%H:%M:%SZ",)
 
     return converter
+
+
+@pytest.fixture
+def asgi_get():
+    """GET a path from an ASGI application, as served by uvicorn.
+
+    Unlike AsyncClient, the handler iterates the response body in the
+    event loop. Like the test clients, the connection of the test is
+    kept open unless ``close_connections``.
+    """
+    def get(path, query_string=b'', headers=(), application=None,
+            close_connections=False):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query_string,
+            'root_path': '',
+            'headers': list(headers),
+            'client': ('127.0.0.1', 50000),
+            'server': ('testserver', 80),
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        if not close_connections:
+            request_started.disconnect(close_old_connections)
+            request_finished.disconnect(close_old_connections)
+        try:
+            async_to_sync(application or ASGIHandler())(scope, receive, send)
+        finally:
+            if not close_connections:
+                request_started.connect(close_old_connections)
+                request_finished.connect(close_old_connections)
+
+        start, *body = messages
+        return start['status'], b''.join(
+            message.get('body', b'') for message in body
+        )
+
+    return get
@@ -0,0 +1,115 @@
+import datetime
+
+import pytest
+from django.contrib import admin
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.admin import TaskAdmin
+from api.models import Task, User
+
+
+@pytest.fixture
+def admin_client(client):
+    user = User.objects.create_superuser(
+        username='admin', email='admin@mail.ru', password='123qeqweQ_4'
+    )
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def tasks(set_of_tasks_data):
+    user = set_of_tasks_data['task1'].user
+    Task.objects.bulk_create(
+        Task(
+            title='later', user=user,
+            start_date=datetime.datetime(*date, tzinfo=timezone.utc),
+            end_date=datetime.datetime(*date, tzinfo=timezone.utc),
+        )
+        for date in [(2019, 8, 30), (2019, 12, 31, 23), (2021, 2, 1)]
+    )
+    return set_of_tasks_data
+
+
+def get_changelist(client, **params):
+    response = client.get(reverse('admin:api_task_changelist'), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.context['cl']
+
+
+def test_checks():
+    assert TaskAdmin(Task, admin.site).check() == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('kind', ['year', 'month', 'day'])
+@pytest.mark.parametrize('order', ['ASC', 'DESC'])
+def test_datetimes(tasks, kind, order):
+    queryset = TaskAdmin(Task, admin.site).get_queryset(None)
+
+    assert queryset.datetimes('start_date', kind, order) == list(
+        Task.objects.datetimes('start_date', kind, order)
+    )
+    assert queryset.filter(title='later').datetimes(
+        'start_date', kind, order
+    ) == list(
+        Task.objects.filter(title='later').datetimes('start_date', kind, order)
+    )
+
+
+@pytest.mark.django_db
+def test_date_hierarchy(admin_client, tasks):
+    response = admin_client.get(reverse('admin:api_task_changelist'))
+    assert b'?start_date__year=2019' in response.content
+    assert b'?start_date__year=2021' in response.content
+    assert b'?start_date__year=2020' not in response.content
+
+    cl = get_changelist(
+        admin_client, start_date__year='2019', start_date__month='8'
+    )
+    assert cl.result_count == 5
+
+
+@pytest.mark.django_db
+def test_search(admin_client, tasks):
+    task = tasks['task1']
+
+    assert list(get_changelist(admin_client, q=task.pk).result_list) == [task]
+    assert get_changelist(
+        admin_client, q=task.user.username
+    ).result_count == 5
+    assert get_changelist(
+        admin_client, q=task.user.email.upper()
+    ).result_count == 5
+    assert get_changelist(admin_client, q='task').result_count == 0
+    assert get_changelist(admin_client, q='9' * 20).result_count == 0
+
+
+@pytest.mark.django_db
+def test_estimated_count(admin_client, tasks, settings):
+    assert get_changelist(admin_client).result_count == 7
+
+    settings.ADMIN_EXACT_COUNT_LIMIT = -1
+    cl = get_changelist(admin_client)
+    assert cl.result_count > 0
+    assert cl.full_result_count is None
+
+
+@pytest.mark.django_db
+def test_complete_from_changelist(admin_client, tasks):
+    task = tasks['task1']
+    url = reverse('admin:api_task_changelist') + f'?q={task.pk}'
+
+    response = admin_client.post(url, {
+        'form-TOTAL_FORMS': '1',
+        'form-INITIAL_FORMS': '1',
+        'form-0-id': task.pk,
+        'form-0-completed': 'on',
+        '_save': 'Save',
+    })
+
+    assert response.status_code == status.HTTP_302_FOUND
+    task.refresh_from_db()
+    assert task.completed
@@ -0,0 +1,114 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import Task
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name, params', [
+    ('task-list', {}),
+    ('task-list', {'year': 2019, 'month': 8}),
+    ('task-list', {'page_size': 1}),
+    ('task-list', {'year': 'abc'}),
+    ('task-statuses', {}),
+    ('task-statuses', {'month': 8}),
+])
+def test_same_as_sync_api(
+        client,
+        auth_header,
+        set_of_tasks_data,
+        name,
+        params,
+):
+    expected = client.get(
+        reverse(name), params, HTTP_AUTHORIZATION=auth_header
+    )
+    response = client.get(
+        reverse(f'async-{name}'), params, HTTP_AUTHORIZATION=auth_header
+    )
+
+    data = response.json()
+    if 'next' in data:
+        # Next pages link to the async endpoint.
+        data['next'] = data['next'].replace('/async/', '/')
+
+    assert response.status_code == expected.status_code
+    assert data == expected.json()
+
+
+@pytest.mark.django_db
+def test_retrieve(client, auth_header, set_of_tasks_data):
+    for task, status_code in [(set_of_tasks_data['task1'], 200),
+                              (set_of_tasks_data['task3'], 404)]:
+        expected = client.get(
+            reverse('task-detail', args=[task.id]),
+            HTTP_AUTHORIZATION=auth_header,
+        )
+        response = client.get(
+            reverse('async-task-detail', args=[task.id]),
+            HTTP_AUTHORIZATION=auth_header,
+        )
+
+        assert response.status_code == status_code
+        assert response.json() == expected.json()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('data, status_code', [
+    ({'title': 'task', 'start_date': '2019-08-24T14:15:22Z',
+      'end_date': '2019-10-24T14:15:22Z'}, status.HTTP_201_CREATED),
+    ({'title': 'task'}, status.HTTP_400_BAD_REQUEST),
+])
+def test_create(client, auth_header, set_of_accounts_data, data, status_code):
+    response = client.post(
+        reverse('async-task-list'),
+        data=data,
+        HTTP_AUTHORIZATION=auth_header,
+        content_type='application/json',
+    )
+
+    assert response.status_code == status_code
+    if status_code == status.HTTP_201_CREATED:
+        task = Task.objects.get()
+        assert task.user.username == set_of_accounts_data['account1'][
+            'username'
+        ]
+        assert response.json()['id'] == task.id
+    else:
+        assert response.json() == {'start_date': 'This field is required.'}
+
+
+@pytest.mark.django_db
+def test_errors(client, auth_header):
+    url = reverse('async-task-list')
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response['WWW-Authenticate'] == 'Bearer realm="api"'
+
+    response = client.get(url, HTTP_AUTHORIZATION='Bearer invalid')
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()['code'] == 'token_not_valid'
+
+    response = client.delete(url, HTTP_AUTHORIZATION=auth_header)
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    response = client.post(
+        url, data='[', HTTP_AUTHORIZATION=auth_header,
+        content_type='application/json',
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_served_by_asgi_handler(async_client, auth_header, set_of_tasks_data):
+    response = async_to_sync(async_client.get)(
+        reverse('async-task-list'), authorization=auth_header
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [task['id'] for task in response.json()] == [
+        set_of_tasks_data['task1'].id, set_of_tasks_data['task2'].id,
+    ]
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from api.authentication import LazyUser
+from api.models import User
+
+
+@pytest.mark.django_db
+def test_lazy_user(set_of_users_data, django_assert_num_queries):
+    user = set_of_users_data['user1']
+
+    with django_assert_num_queries(0):
+        lazy_user = LazyUser(user.pk)
+        assert lazy_user
+        assert lazy_user.pk == lazy_user.id == user.pk
+        assert lazy_user.is_authenticated
+        assert not lazy_user.is_anonymous
+
+    with django_assert_num_queries(1):
+        assert lazy_user.username == user.username
+        assert lazy_user.email == user.email
+
+
+@pytest.mark.django_db
+def test_active_user_is_cached(client, auth_header, django_assert_num_queries):
+    url = reverse('task-list')
+
+    # The is_active check and tasks.
+    with django_assert_num_queries(2):
+        response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+    assert response.status_code == status.HTTP_200_OK
+
+    with django_assert_num_queries(1):
+        response = client.get(
+            url, {'year': 2020}, HTTP_AUTHORIZATION=auth_header
+        )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_inactive_user(client, auth_header, settings):
+    settings.JWT_USER_ACTIVE_CACHE_TIMEOUT = 0
+    url = reverse('task-list')
+    client.get(url, HTTP_AUTHORIZATION=auth_header)
+
+    User.objects.update(is_active=False)
+    response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data['code'] == 'user_inactive'
+
+
+@pytest.mark.django_db
+def test_inactive_user_after_cache_timeout(
+        client,
+        auth_header,
+        settings,
+        monkeypatch,
+):
+    url = reverse('task-list')
+    client.get(url, HTTP_AUTHORIZATION=auth_header)
+    User.objects.update(is_active=False)
+
+    response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+    assert response.status_code == status.HTTP_200_OK
+
+    now = time.monotonic() + settings.JWT_USER_ACTIVE_CACHE_TIMEOUT
+    monkeypatch.setattr('api.authentication.time.monotonic', lambda: now)
+    response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data['code'] == 'user_inactive'
+
+
+@pytest.mark.django_db
+def test_check_without_cache(
+        client,
+        auth_header,
+        settings,
+        django_assert_num_queries,
+):
+    settings.JWT_USER_ACTIVE_CACHE_TIMEOUT = 0
+    url = reverse('task-list')
+    client.get(url, HTTP_AUTHORIZATION=auth_header)
+
+    # The is_active check and tasks.
+    with django_assert_num_queries(2):
+        client.get(url, {'year': 2020}, HTTP_AUTHORIZATION=auth_header)
+
+
+@pytest.mark.django_db
+def test_deleted_user(client, auth_header):
+    User.objects.all().delete()
+
+    response = client.get(reverse('task-list'), HTTP_AUTHORIZATION=auth_header)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data['code'] == 'user_not_found'
@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection, OperationalError
+
+from api.postgresql.base import DatabaseWrapper
+
+
+@pytest.fixture
+def make_connection():
+    """Make connections outside of the transaction of the test."""
+    wrappers = []
+
+    def make(**settings):
+        wrapper = DatabaseWrapper({**connection.settings_dict, **settings})
+        wrappers.append(wrapper)
+        return wrapper
+
+    yield make
+    for wrapper in wrappers:
+        wrapper.close()
+
+
+def get_backend_pid(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+def terminate(pid):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+
+
+@pytest.mark.django_db
+def test_connection_is_reused(make_connection):
+    wrapper = make_connection(CONN_MAX_AGE=60)
+    pid = get_backend_pid(wrapper)
+
+    # The request finishes and the next one starts.
+    wrapper.close_if_unusable_or_obsolete()
+
+    assert get_backend_pid(wrapper) == pid
+
+
+@pytest.mark.django_db
+def test_health_check_once_per_request(make_connection, monkeypatch):
+    wrapper = make_connection(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True)
+    checks = []
+    is_usable = wrapper.is_usable
+    monkeypatch.setattr(
+        wrapper, 'is_usable', lambda: checks.append(1) or is_usable()
+    )
+
+    # A new connection is not checked.
+    get_backend_pid(wrapper)
+    get_backend_pid(wrapper)
+    assert checks == []
+
+    wrapper.close_if_unusable_or_obsolete()
+    get_backend_pid(wrapper)
+    get_backend_pid(wrapper)
+    assert checks == [1]
+
+
+@pytest.mark.django_db
+def test_health_check_replaces_broken_connection(make_connection):
+    wrapper = make_connection(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True)
+    pid = get_backend_pid(wrapper)
+
+    wrapper.close_if_unusable_or_obsolete()
+    terminate(pid)
+
+    new_pid = get_backend_pid(wrapper)
+    assert new_pid != pid
+
+
+@pytest.mark.django_db
+def test_broken_connection_without_health_check(make_connection):
+    wrapper = make_connection(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=False)
+    pid = get_backend_pid(wrapper)
+
+    wrapper.close_if_unusable_or_obsolete()
+    terminate(pid)
+
+    with pytest.raises(OperationalError):
+        get_backend_pid(wrapper)
@@ -1,8 +1,15 @@
+import threading
+import time
+
 import pytest
 
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
 from rest_framework import status
 
+from api import hashers
+from api.models import User
+
 
 @pytest.mark.django_db
 def test_correct_user_login(client, set_of_accounts_data):
@@ -40,3 +47,84 @@ def test_blank_user_login(client):
     }
     response = client.post(url, data=data)
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_registered_password_uses_preferred_hasher(set_of_accounts_data):
+    user = User.objects.get(
+        username=set_of_accounts_data['account1']['username']
+    )
+
+    assert user.password.startswith('argon2$argon2id$')
+    assert user.check_password(set_of_accounts_data['account1']['password'])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('hasher', ['pbkdf2_sha256', 'scrypt'])
+def test_login_rehashes_password(client, hasher):
+    User.objects.create(
+        username='olduser',
+        password=make_password('123qeqweQ_4', hasher=hasher),
+    )
+
+    response = client.post(reverse('token_obtain_pair'), data={
+        'username': 'olduser',
+        'password': '123qeqweQ_4',
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+    user = User.objects.get(username='olduser')
+    assert user.password.startswith('argon2$')
+    assert user.check_password('123qeqweQ_4')
+
+
+@pytest.mark.django_db
+def test_wrong_password_keeps_hash(client):
+    password = make_password('123qeqweQ_4', hasher='pbkdf2_sha256')
+    User.objects.create(username='olduser', password=password)
+
+    response = client.post(reverse('token_obtain_pair'), data={
+        'username': 'olduser',
+        'password': 'wrong',
+    })
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert User.objects.get(username='olduser').password == password
+
+
+def test_hashing_concurrency_limited(monkeypatch, settings):
+    settings.PASSWORD_HASHING_CONCURRENCY = 2
+    monkeypatch.setattr(hashers, '_semaphore', None)
+    lock = threading.Lock()
+    running = []
+    peak = []
+    full = threading.Event()
+    release = threading.Event()
+
+    def hash_password():
+        with lock:
+            running.append(None)
+            peak.append(len(running))
+            if len(running) == 2:
+                full.set()
+        release.wait(1)
+        with lock:
+            running.pop()
+
+    threads = [
+        threading.Thread(target=hashers.run_limited, args=(hash_password,))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    assert full.wait(1)
+    # Give the other threads time to get past the limit, if they could.
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+    # Nested calls run in place instead of waiting for a free slot.
+    assert hashers.run_limited(hashers.run_limited, lambda: 1) == 1
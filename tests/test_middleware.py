@@ -0,0 +1,72 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import User
+
+
+@pytest.fixture
+def admin_user():
+    return User.objects.create_superuser(
+        username='admin', email='admin@mail.ru', password='123qeqweQ_4'
+    )
+
+
+@pytest.mark.django_db
+def test_api_request_skips_middleware(client, auth_header):
+    response = client.get(
+        reverse('task-list'), HTTP_AUTHORIZATION=auth_header
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not hasattr(response.wsgi_request, 'session')
+    assert not hasattr(response.wsgi_request, '_messages')
+    assert 'Cookie' not in response.get('Vary', '')
+    assert not response.cookies
+
+
+@pytest.mark.django_db
+def test_api_request_without_csrf_token(set_of_accounts_data):
+    client = Client(enforce_csrf_checks=True)
+    account = set_of_accounts_data['account1']
+
+    response = client.post(reverse('token_obtain_pair'), {
+        'username': account['username'],
+        'password': account['password'],
+    })
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_admin_uses_middleware(client, admin_user):
+    response = client.get(reverse('admin:login'))
+    assert response.status_code == status.HTTP_200_OK
+    assert 'csrftoken' in response.cookies
+
+    client.force_login(admin_user)
+    response = client.get(reverse('admin:index'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.wsgi_request.user == admin_user
+    assert response.wsgi_request.session.session_key
+
+
+@pytest.mark.django_db
+def test_admin_checks_csrf(admin_user):
+    client = Client(enforce_csrf_checks=True)
+
+    response = client.post(reverse('admin:login'), {
+        'username': 'admin', 'password': '123qeqweQ_4',
+    })
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_admin_under_asgi(async_client):
+    response = async_to_sync(async_client.get)(reverse('admin:login'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'csrftoken' in response.cookies
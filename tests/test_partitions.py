@@ -0,0 +1,201 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api import partitions
+from api.filters import filter_by_start_date
+from api.models import Task
+
+
+def get_partitions():
+    with connection.cursor() as cursor:
+        return partitions.get_partitions(cursor)
+
+
+def count_rows(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM {table}')
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def partitioned(set_of_tasks_data, settings):
+    settings.TASKS_PARTITIONS_AHEAD = 2
+    # Tasks in another month.
+    user = set_of_tasks_data['task1'].user
+    Task.objects.bulk_create(
+        Task(
+            title='march', user=user,
+            start_date=datetime.datetime(2022, 3, day, tzinfo=timezone.utc),
+            end_date=datetime.datetime(2022, 3, day, tzinfo=timezone.utc),
+        )
+        for day in range(1, 11)
+    )
+    assert partitions.partition_table()
+    return set_of_tasks_data
+
+
+def test_add_months():
+    assert partitions.add_months(2022, 3, 0) == (2022, 3)
+    assert partitions.add_months(2022, 3, 10) == (2023, 1)
+    assert partitions.add_months(2022, 12, 13) == (2024, 1)
+
+
+@pytest.mark.django_db
+def test_partition_table(partitioned):
+    coming = [
+        partitions.get_partition_name(year, month)
+        for year, month in partitions.get_coming_months()
+    ]
+    assert len(coming) == 3
+    assert get_partitions() == sorted([
+        'api_task_default', 'api_task_p2019_08', 'api_task_p2022_03', *coming,
+    ])
+    assert count_rows('api_task') == 14
+    assert count_rows('api_task_p2019_08') == 4
+    assert count_rows('api_task_p2022_03') == 10
+    assert count_rows('api_task_default') == 0
+
+    # Indexes and constraints are the ones of the plain table.
+    constraints = connection.introspection.get_constraints(
+        connection.cursor(), 'api_task'
+    )
+    assert constraints['api_task_pkey']['columns'] == ['id', 'start_date']
+    assert constraints['api_task_user_start_date_idx']['columns'] == [
+        'user_id', 'start_date', 'id',
+    ]
+    assert 'api_task_user_version_idx' in constraints
+    assert any(
+        constraint['foreign_key'] == ('auth_user', 'id')
+        for constraint in constraints.values()
+    )
+
+    # The id sequence carries on.
+    task = Task.objects.create(
+        title='new', user=partitioned['task1'].user,
+        start_date=timezone.now(), end_date=timezone.now(),
+    )
+    assert task.pk > Task.objects.exclude(pk=task.pk).latest('pk').pk
+
+    assert not partitions.partition_table()
+
+
+@pytest.mark.django_db
+def test_month_is_pruned(partitioned):
+    queryset = filter_by_start_date(
+        Task.objects.filter(user=partitioned['task1'].user),
+        {'year': '2022', 'month': '3'},
+    )
+
+    plan = queryset.explain()
+    assert 'api_task_p2022_03' in plan
+    assert 'api_task_p2019_08' not in plan
+    assert 'api_task_default' not in plan
+    assert queryset.count() == 10
+
+
+@pytest.mark.django_db
+def test_create_partition_moves_rows(partitioned):
+    Task.objects.create(
+        title='far', user=partitioned['task1'].user,
+        start_date=datetime.datetime(2100, 5, 2, tzinfo=timezone.utc),
+        end_date=datetime.datetime(2100, 5, 2, tzinfo=timezone.utc),
+    )
+    assert count_rows('api_task_default') == 1
+
+    with connection.cursor() as cursor:
+        assert partitions.create_partition(cursor, 2100, 5)
+        assert not partitions.create_partition(cursor, 2100, 5)
+
+    assert count_rows('api_task_default') == 0
+    assert count_rows('api_task_p2100_05') == 1
+
+
+@pytest.mark.django_db
+def test_create_partitions(partitioned):
+    created = partitions.create_partitions(months=4)
+
+    year, month = partitions.get_coming_months(4)[-1]
+    assert created == [
+        partitions.get_partition_name(*partitions.add_months(year, month, -1)),
+        partitions.get_partition_name(year, month),
+    ]
+    assert partitions.create_partitions(months=4) == []
+
+
+@pytest.mark.django_db
+def test_create_partitions_without_partitioning(set_of_tasks_data):
+    assert partitions.create_partitions() == []
+    assert get_partitions() == []
+
+
+@pytest.mark.django_db
+def test_unpartition_table(partitioned):
+    assert partitions.unpartition_table()
+
+    assert get_partitions() == []
+    assert count_rows('api_task') == 14
+    constraints = connection.introspection.get_constraints(
+        connection.cursor(), 'api_task'
+    )
+    assert constraints['api_task_pkey']['columns'] == ['id']
+    assert 'api_task_user_start_date_idx' in constraints
+
+    assert not partitions.unpartition_table()
+
+
+@pytest.mark.django_db
+def test_task_api(partitioned, client, auth_header):
+    url = reverse('task-list') + '?year=2022&month=3'
+
+    response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 10
+
+    # Moving a task to another month moves it to another partition.
+    task = partitioned['task1']
+    response = client.patch(
+        reverse('task-detail', args=[task.pk]),
+        {
+            'start_date': '2022-03-15T00:00:00Z',
+            'end_date': '2022-03-16T00:00:00Z',
+        },
+        content_type='application/json',
+        HTTP_AUTHORIZATION=auth_header,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert count_rows('api_task_p2022_03') == 11
+
+    response = client.delete(
+        reverse('task-detail', args=[task.pk]),
+        HTTP_AUTHORIZATION=auth_header,
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert count_rows('api_task_p2022_03') == 10
+
+
+@pytest.mark.django_db
+def test_command(set_of_tasks_data, settings):
+    settings.TASKS_PARTITIONS_AHEAD = 1
+
+    with pytest.raises(CommandError):
+        call_command('partition_tasks')
+
+    out = StringIO()
+    call_command('partition_tasks', '--enable', stdout=out)
+    assert 'Partitioned the task table.' in out.getvalue()
+    assert 'api_task_p2019_08' in get_partitions()
+
+    out = StringIO()
+    call_command('partition_tasks', '--months', '3', stdout=out)
+    assert out.getvalue() == 'Created 2 partitions.\n'
+
+    out = StringIO()
+    call_command('partition_tasks', '--disable', stdout=out)
+    assert get_partitions() == []
@@ -1,9 +1,12 @@
 import pytest
 
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from api.models import User
+from api.serializers import RegisterSerializer
 
 
 @pytest.mark.django_db
@@ -89,3 +92,87 @@ def test_register_user_with_same_email_in_upper_case(
     assert 'email' in response.data
 
     assert User.objects.count() == len(list(set_of_users_data.keys()))
+
+
+@pytest.mark.django_db
+def test_new_user_register_with_single_insert(
+        client,
+        django_assert_num_queries,
+):
+    url = reverse('register-list')
+    data = {
+        'username': 'test',
+        'email': 'Test@Mail.ru',
+        'password': '123qeqweQ_4',
+    }
+
+    # Savepoint, INSERT and savepoint release.
+    with django_assert_num_queries(3) as queries:
+        response = client.post(url, data=data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['email'] == 'test@mail.ru'
+    assert queries.captured_queries[1]['sql'].startswith('INSERT')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('field, value, message', [
+    ('username', 'testuser', 'A user with that username already exists.'),
+    ('email', 'TESTUSER@mail.ru', 'A user with this email already exist'),
+])
+def test_register_duplicate_of_valid_data(
+        client,
+        set_of_users_data,
+        field,
+        value,
+        message,
+):
+    url = reverse('register-list')
+    data = {
+        'username': 'test',
+        'email': 'test@mail.ru',
+        'password': '123qeqweQ_4',
+        field: value,
+    }
+    response = client.post(url, data=data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {field: message}
+
+    assert User.objects.count() == len(set_of_users_data)
+
+
+@pytest.mark.django_db
+def test_register_reports_duplicates_with_other_errors(set_of_users_data):
+    serializer = RegisterSerializer(data={
+        'username': 'testuser',
+        'email': 'UserTest@mail.ru',
+        'password': '1234',
+    })
+
+    assert not serializer.is_valid()
+    assert list(serializer.errors) == ['username', 'email', 'password']
+
+
+@pytest.mark.django_db
+def test_email_is_unique_regardless_of_case(set_of_users_data):
+    User.objects.create(username='blank1')
+    User.objects.create(username='blank2')
+
+    with pytest.raises(IntegrityError):
+        User.objects.create(username='other', email='TestUser@Mail.RU')
+
+
+@pytest.mark.django_db
+def test_email_exists_uses_index(set_of_users_data):
+    serializer = RegisterSerializer()
+    with CaptureQueriesContext(connection) as queries:
+        assert serializer.exists('email', 'TESTUSER@mail.ru')
+
+    with connection.cursor() as cursor:
+        # The test table is tiny, keep the planner off seq scans.
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {queries[0]["sql"]}')
+        plan = '\n'.join(row for row, in cursor.fetchall())
+
+    assert 'auth_user_email_lower_uniq' in plan
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from api import routers
+from api.cache import bump_generation, get_generation_key
+from api.models import Task, User
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica1', 'replica2']
+    settings.DATABASE_REPLICA_PIN_TIMEOUT = 10
+
+
+@pytest.fixture
+def router():
+    return routers.ReplicaRouter()
+
+
+def set_last_write(user_id, seconds_ago):
+    cache.set(
+        get_generation_key(user_id), time.time_ns() - seconds_ago * 10 ** 9,
+        None,
+    )
+
+
+def test_reads_go_to_primary(replicas, router):
+    assert router.db_for_read(Task) == 'default'
+    assert router.db_for_write(Task) == 'default'
+
+
+def test_replica_reads(replicas, router):
+    set_last_write(1, 60)
+
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) in ['replica1', 'replica2']
+        assert router.db_for_write(Task) == 'default'
+
+    assert router.db_for_read(Task) == 'default'
+
+
+def test_replica_reads_without_replicas(settings, router):
+    settings.DATABASE_REPLICAS = []
+    set_last_write(1, 60)
+
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) == 'default'
+
+
+def test_pinned_after_write(replicas, router, settings):
+    set_last_write(1, 60)
+    bump_generation(1)
+
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) == 'default'
+
+    # Other users are not pinned.
+    set_last_write(2, 60)
+    with routers.replica_reads(2):
+        assert router.db_for_read(Task) != 'default'
+
+    settings.DATABASE_REPLICA_PIN_TIMEOUT = 0
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) != 'default'
+
+
+def test_pinned_without_generation(replicas, router):
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) == 'default'
+
+
+def test_primary_in_transaction(replicas, router, monkeypatch):
+    set_last_write(1, 60)
+    monkeypatch.setattr(connection, 'in_atomic_block', True)
+
+    with routers.replica_reads(1):
+        assert router.db_for_read(Task) == 'default'
+
+
+def test_migrations_skip_replicas(replicas, router):
+    assert router.allow_migrate('default', 'api')
+    assert not router.allow_migrate('replica1', 'api')
+
+
+@pytest.mark.django_db
+def test_read_actions_use_replicas(
+    replicas, client, account, set_of_tasks_data, monkeypatch, settings,
+):
+    """Read actions ask for replica reads unless the user just wrote."""
+    settings.TASKS_CACHE_TIMEOUT = 0
+    auth_header = account['auth_header']
+    user = User.objects.get(username=account['username'])
+    task = set_of_tasks_data['task1']
+    reads = []
+    monkeypatch.setattr(
+        routers.ReplicaRouter, 'db_for_read',
+        lambda self, model, **hints: reads.append(
+            routers._replica_reads.get()
+        ) or 'default',
+    )
+
+    def get(url):
+        reads.clear()
+        response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+        assert response.status_code == status.HTTP_200_OK
+        if response.streaming:
+            # Streamed tasks are read after the view returned.
+            b''.join(response.streaming_content)
+        return reads
+
+    urls = [
+        reverse('task-list'),
+        reverse('task-list') + '?stream=1',
+        reverse('task-detail', args=[task.pk]),
+        reverse('task-statuses') + '?year=2022&month=6',
+        reverse('async-task-list'),
+        reverse('async-task-detail', args=[task.pk]),
+        reverse('async-task-statuses') + '?year=2022&month=6',
+    ]
+
+    set_last_write(user.pk, 60)
+    for url in urls:
+        # The tasks, after the authentication's reads.
+        assert get(url)[-1], url
+
+    set_last_write(user.pk, 0)
+    for url in urls:
+        reads = get(url)
+        assert reads and not any(reads), url
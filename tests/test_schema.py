@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.urls import resolve
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework import mixins, status
+
+from api.views import TaskViewSet
+
+
+@pytest.fixture(autouse=True)
+def clear_schemas():
+    view = resolve('/swagger.json').func.cls
+    view.schemas.clear()
+    view.rendered.clear()
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Count the schema generations."""
+    calls = []
+    get_schema = OpenAPISchemaGenerator.get_schema
+
+    def counting_get_schema(self, request=None, public=False):
+        calls.append(request.path)
+        return get_schema(self, request, public)
+
+    monkeypatch.setattr(
+        OpenAPISchemaGenerator, 'get_schema', counting_get_schema
+    )
+    return calls
+
+
+def test_schema_is_generated_once(client, generated):
+    first = client.get('/swagger.json')
+    second = client.get('/swagger.json')
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    assert first.json()['paths']
+    assert generated == ['/swagger.json']
+
+
+def test_schema_caching_headers(client, settings):
+    settings.SCHEMA_CACHE_MAX_AGE = 600
+
+    response = client.get('/swagger.json')
+
+    assert response['Content-Type'] == 'application/json; charset=utf-8'
+    assert response['ETag']
+    assert response['Cache-Control'] == 'public, max-age=600'
+    assert 'Accept' in response['Vary']
+
+
+def test_schema_not_modified(client, generated):
+    etag = client.get('/swagger.json')['ETag']
+
+    response = client.get('/swagger.json', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert response['Cache-Control'].startswith('public')
+    assert not response.content
+    assert len(generated) == 1
+
+
+def test_formats_have_own_etag(client):
+    json = client.get('/swagger.json')
+    openapi = client.get('/swagger/?format=openapi')
+
+    assert openapi['Content-Type'] == 'application/openapi+json; charset=utf-8'
+    assert json.content == openapi.content
+    assert json['ETag'] != openapi['ETag']
+
+
+@pytest.mark.parametrize('url', ['/swagger/', '/redoc/'])
+def test_web_ui(client, url):
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'text/html; charset=utf-8'
+
+
+def test_web_ui_uses_cached_schema(client, generated):
+    for url in ['/swagger/', '/redoc/', '/swagger/', '/swagger.json']:
+        assert client.get(url).status_code == status.HTTP_200_OK
+
+    assert len(generated) == 1
+
+
+def test_schema_independent_of_host(client, generated, settings):
+    settings.ALLOWED_HOSTS = ['*']
+
+    first = client.get('/swagger.json', HTTP_HOST='a.example.com')
+    second = client.get('/swagger.json', HTTP_HOST='b.example.com')
+
+    assert first.content == second.content
+    assert 'host' not in first.json()
+    assert len(generated) == 1
+    assert len(resolve('/swagger.json').func.cls.rendered) == 1
+
+
+def test_rendered_schemas_bounded(client, monkeypatch):
+    view = resolve('/swagger.json').func.cls
+    monkeypatch.setattr(view, 'max_cached', 1)
+
+    client.get('/swagger.json')
+    client.get('/swagger/?format=openapi')
+
+    assert list(view.rendered) == [('openapi', '')]
+
+
+def test_inherited_method_documented_on_view():
+    assert TaskViewSet.create._swagger_auto_schema['responses']
+    assert not hasattr(mixins.CreateModelMixin.create, '_swagger_auto_schema')
+
+
+def test_docs_disabled():
+    """The workers import neither drf_yasg nor the documentation."""
+    code = (
+        'import sys, django\n'
+        'from django.conf import settings\n'
+        'from django.urls import get_resolver, Resolver404\n'
+        'django.setup()\n'
+        'resolver = get_resolver()\n'
+        'resolver.resolve("/api/v1/tasks/")\n'
+        'try:\n'
+        '    resolver.resolve("/swagger.json")\n'
+        'except Resolver404:\n'
+        '    pass\n'
+        'else:\n'
+        '    sys.exit("/swagger.json is served")\n'
+        'assert "drf_yasg" not in settings.INSTALLED_APPS\n'
+        'print(sorted(\n'
+        '    name for name in sys.modules\n'
+        '    if name.startswith(("drf_yasg", "api.docs", "pytest"))\n'
+        '))\n'
+    )
+    env = {
+        **os.environ,
+        'API_DOCS_ENABLED': 'false',
+        'DJANGO_SETTINGS_MODULE': 'ToDoCalendar.settings',
+    }
+
+    result = subprocess.run(
+        [sys.executable, '-c', code], env=env, cwd=settings.BASE_DIR,
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == '[]\n'
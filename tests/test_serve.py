@@ -0,0 +1,124 @@
+import importlib
+import io
+
+import pytest
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from api.management.commands import serve
+
+
+@pytest.fixture
+def cpu_count(monkeypatch):
+    monkeypatch.setattr(serve.os, 'cpu_count', lambda: 4)
+
+
+@pytest.fixture
+def served(monkeypatch, settings):
+    """Capture the gunicorn application instead of running it."""
+    # serve changes the connection settings in place.
+    for database in settings.DATABASES.values():
+        monkeypatch.setitem(database, 'CONN_MAX_AGE', database['CONN_MAX_AGE'])
+    applications = []
+    monkeypatch.setattr(
+        serve.GunicornApplication, 'run',
+        lambda application: applications.append(application),
+    )
+    return applications
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path,
+        }
+    }
+
+
+def test_default_workers(cpu_count):
+    assert serve.get_default_workers('wsgi') == 9
+    assert serve.get_default_workers('asgi') == 4
+
+
+def test_wsgi_options(cpu_count, settings):
+    settings.SERVER_MAX_REQUESTS = 1000
+    options = serve.get_options('wsgi', '127.0.0.1:8000', None, None)
+
+    assert options['bind'] == '127.0.0.1:8000'
+    assert options['workers'] == 9
+    assert options['threads'] == 1
+    assert options['preload_app']
+    assert options['max_requests'] == 1000
+    assert options['max_requests_jitter'] == 100
+    assert 'worker_class' not in options
+
+
+def test_asgi_options(cpu_count):
+    options = serve.get_options('asgi', '127.0.0.1:8000', 2, None)
+
+    assert options['workers'] == 2
+    assert options['worker_class'] == 'uvicorn.workers.UvicornWorker'
+    assert 'threads' not in options
+
+
+def test_serve_wsgi(served, cpu_count, shared_cache):
+    call_command('serve', '--bind', '127.0.0.1:9000', '--threads', '4')
+
+    application, = served
+    assert isinstance(application.load(), WSGIHandler)
+    assert application.cfg.bind == ['127.0.0.1:9000']
+    assert application.cfg.workers == 9
+    assert application.cfg.threads == 4
+    assert application.cfg.preload_app
+
+
+def test_serve_asgi(served, shared_cache, settings):
+    call_command('serve', '--interface', 'asgi', '--workers', '3')
+
+    application, = served
+    assert isinstance(application.load(), ASGIHandler)
+    assert application.cfg.workers == 3
+    assert application.cfg.worker_class_str == 'uvicorn.workers.UvicornWorker'
+    assert all(
+        database['CONN_MAX_AGE'] == 0
+        for database in settings.DATABASES.values()
+    )
+
+
+def test_serve_workers_without_shared_cache(served):
+    stderr = io.StringIO()
+    call_command('serve', '--workers', '2', stderr=stderr)
+
+    application, = served
+    assert application.cfg.workers == 1
+    assert 'REDIS_URL' in stderr.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_closes_connections(
+        asgi_get,
+        auth_header,
+        monkeypatch,
+        settings,
+):
+    """The ASGI entry point closes connections whatever server runs it."""
+    for database in settings.DATABASES.values():
+        monkeypatch.setitem(database, 'CONN_MAX_AGE', 60)
+    asgi = importlib.reload(importlib.import_module('ToDoCalendar.asgi'))
+    # Connections opened before the import keep their lifetime.
+    connection.close()
+
+    status_code, _ = asgi_get(
+        reverse('async-task-list'),
+        headers=[(b'authorization', auth_header.encode())],
+        application=asgi.application,
+        close_connections=True,
+    )
+
+    assert status_code == 200
+    assert connection.connection is None
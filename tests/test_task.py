@@ -1,8 +1,25 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 
-from api.models import User, Task
+from api.filters import filter_by_date_window, filter_by_start_date
+from api.models import User, Task, TaskTombstone
+from api.pagination import TaskCursorPagination
+from api.serializers import TaskSerializer, TaskValuesSerializer
+from api.sync import encode_token
 
 
 class TestCreateTask:
@@ -559,6 +576,379 @@ class TestListTask:
         assert task.start_date.month == 6
         assert task.start_date.day == 6
 
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params, count', [
+        ({'year': 2019, 'month': 12, 'day': 31}, 1),
+        ({'year': 2019, 'month': 2, 'day': 30}, 0),
+        ({'year': 2019, 'day': 31}, 2),
+        ({'year': 2020}, 1),
+    ])
+    def test_list_task_with_date_boundaries(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+            params,
+            count,
+    ):
+        url = reverse('task-list')
+
+        account = set_of_authenticated_accounts_data["authenticated_account1"]
+        user = User.objects.get(username=account['username'])
+
+        for start_date in ['2019-10-31T23:59:59Z', '2019-12-31T00:00:00Z',
+                           '2019-12-30T23:59:59Z', '2020-01-01T00:00:00Z']:
+            Task.objects.create(title='task', start_date=start_date,
+                                end_date='2020-10-24T14:15:22Z', user=user)
+
+        response = client.get(
+            url,
+            params,
+            HTTP_AUTHORIZATION=f'Bearer {account["access-token"]}',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == count
+
+    @pytest.mark.django_db
+    def test_list_task_with_invalid_param(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+    ):
+        url = reverse('task-list')
+        account = set_of_authenticated_accounts_data["authenticated_account1"]
+
+        response = client.get(
+            url,
+            {'year': '2019', 'day': 'first'},
+            HTTP_AUTHORIZATION=f'Bearer {account["access-token"]}',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'day': 'A valid integer is required.'}
+
+
+class TestPaginateTask:
+
+    @pytest.fixture
+    def user_tasks(self, account):
+        user = User.objects.get(username=account['username'])
+
+        for start_date in ['2019-08-03T10:00:00Z', '2019-08-01T10:00:00Z',
+                           '2019-08-02T10:00:00Z', '2019-08-02T10:00:00Z',
+                           '2019-08-02T10:00:00Z']:
+            Task.objects.create(title='task', start_date=start_date,
+                                end_date='2019-10-24T14:15:22Z', user=user)
+
+        return {
+            'auth_header': account['auth_header'],
+            'ids': list(Task.objects.filter(user=user).order_by(
+                'start_date', 'id').values_list('id', flat=True)),
+            'user': user,
+        }
+
+    @pytest.mark.django_db
+    def test_walk_pages(self, client, user_tasks):
+        response = client.get(
+            reverse('task-list'),
+            {'page_size': 2},
+            HTTP_AUTHORIZATION=user_tasks['auth_header'],
+        )
+
+        ids = []
+        pages = 0
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data['results']) <= 2
+            ids.extend(task['id'] for task in response.data['results'])
+            pages += 1
+            if response.data['next'] is None:
+                break
+            response = client.get(
+                response.data['next'],
+                HTTP_AUTHORIZATION=user_tasks['auth_header'],
+            )
+
+        assert pages == 3
+        assert ids == user_tasks['ids']
+
+    @pytest.mark.django_db
+    def test_insert_before_cursor_does_not_shift_pages(
+            self,
+            client,
+            user_tasks,
+    ):
+        response = client.get(
+            reverse('task-list'),
+            {'page_size': 2},
+            HTTP_AUTHORIZATION=user_tasks['auth_header'],
+        )
+        Task.objects.create(title='task', start_date='2019-07-01T10:00:00Z',
+                            end_date='2019-10-24T14:15:22Z',
+                            user=user_tasks['user'])
+
+        response = client.get(
+            response.data['next'],
+            HTTP_AUTHORIZATION=user_tasks['auth_header'],
+        )
+
+        ids = [task['id'] for task in response.data['results']]
+        assert ids == user_tasks['ids'][2:4]
+
+    @pytest.mark.django_db
+    def test_page_size_is_capped(self, client, user_tasks, settings):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(
+                'api.pagination.TaskCursorPagination.max_page_size', 3
+            )
+            response = client.get(
+                reverse('task-list'),
+                {'page_size': 100},
+                HTTP_AUTHORIZATION=user_tasks['auth_header'],
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 3
+        assert response.data['next'] is not None
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('cursor', ['abc', 'bm90LWEtY3Vyc29y'])
+    def test_invalid_cursor(self, client, user_tasks, cursor):
+        response = client.get(
+            reverse('task-list'),
+            {'cursor': cursor},
+            HTTP_AUTHORIZATION=user_tasks['auth_header'],
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data['detail'] == 'Invalid cursor'
+
+
+class TestStreamTask:
+
+    @pytest.fixture(autouse=True)
+    def tasks(self, account):
+        user = User.objects.get(username=account['username'])
+        for i in range(5):
+            Task.objects.create(title=f'task {i}',
+                                start_date=f'2019-08-0{5 - i}T10:00:00Z',
+                                end_date='2019-10-24T14:15:22Z', user=user)
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params', [{}, {'year': 2019}, {'year': 2020}])
+    def test_stream_same_as_list(
+            self,
+            client,
+            auth_header,
+            monkeypatch,
+            params,
+    ):
+        monkeypatch.setattr('api.views.TaskViewSet.stream_chunk_size', 2)
+        url = reverse('task-list')
+
+        expected = client.get(url, params, HTTP_AUTHORIZATION=auth_header)
+        response = client.get(
+            url,
+            {**params, 'stream': 1},
+            HTTP_AUTHORIZATION=auth_header,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/json'
+        assert b''.join(response.streaming_content) == expected.content
+
+    @pytest.mark.django_db
+    def test_stream_ndjson(self, client, auth_header, monkeypatch):
+        monkeypatch.setattr('api.views.TaskViewSet.stream_chunk_size', 2)
+        url = reverse('task-list')
+
+        expected = client.get(url, HTTP_AUTHORIZATION=auth_header)
+        response = client.get(
+            url,
+            HTTP_AUTHORIZATION=auth_header,
+            HTTP_ACCEPT='application/x-ndjson',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+        lines = b''.join(response.streaming_content).splitlines()
+        assert [json.loads(line) for line in lines] == expected.json()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('query_string, accept', [
+        (b'stream=1', b'application/json'),
+        (b'', b'application/x-ndjson'),
+    ])
+    def test_stream_asgi(
+            self,
+            client,
+            auth_header,
+            monkeypatch,
+            asgi_get,
+            query_string,
+            accept,
+    ):
+        monkeypatch.setattr('api.views.TaskViewSet.stream_chunk_size', 2)
+        url = reverse('task-list')
+        expected = client.get(url, HTTP_AUTHORIZATION=auth_header)
+
+        status_code, content = asgi_get(url, query_string, [
+            (b'authorization', auth_header.encode()),
+            (b'accept', accept),
+        ])
+
+        assert status_code == status.HTTP_200_OK
+        if accept == b'application/json':
+            assert content == expected.content
+        else:
+            lines = content.splitlines()
+            assert [json.loads(line) for line in lines] == expected.json()
+
+
+class TestTaskValuesSerializer:
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('time_zone', ['UTC', 'Europe/Minsk'])
+    def test_same_output_as_task_serializer(
+            self,
+            set_of_tasks_data,
+            time_zone,
+    ):
+        user = set_of_tasks_data['task1'].user
+        Task.objects.create(title='задача', description=None,
+                            start_date='2019-08-24T14:15:22.123456Z',
+                            end_date='2019-08-24T23:59:59.5+03:00',
+                            completed=True, user=user)
+        queryset = Task.objects.filter(user=user).order_by('start_date', 'id')
+        renderer = JSONRenderer()
+
+        with timezone.override(time_zone):
+            expected = renderer.render(
+                TaskSerializer(queryset, many=True).data
+            )
+            actual = renderer.render(TaskValuesSerializer(
+                queryset.values(*TaskValuesSerializer.fields)
+            ).data)
+
+        assert actual == expected
+
+
+class TestTaskIndexes:
+
+    @pytest.fixture
+    def explain(self, set_of_tasks_data):
+        # Tasks outside of the filtered dates make the start_date
+        # conditions selective, so the planner prefers the start_date
+        # index to the other indexes on user. Tasks of another user in
+        # the filtered dates keep it off the start_date index of the
+        # admin.
+        user = set_of_tasks_data['task1'].user
+        other_user = set_of_tasks_data['task3'].user
+        Task.objects.bulk_create(
+            Task(title='task', start_date=start_date, end_date=start_date,
+                 user=user)
+            for start_date in ['2021-01-01T00:00:00Z'] * 100
+        )
+        Task.objects.bulk_create(
+            Task(title='task', start_date=start_date, end_date=start_date,
+                 user=other_user)
+            for start_date in [
+                '2019-08-24T00:00:00Z', '2019-10-01T12:00:00Z',
+            ] * 100
+        )
+
+        # The rows written by the test share its transaction id, which
+        # would make the deduplicated version index the smallest one.
+        Task.objects.update(version=F('id'))
+
+        def explain(queryset):
+            # The test tables are tiny, so keep the planner off seq scans
+            # to see whether the index is usable at all.
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE api_task')
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
+
+        return explain
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params', [
+        'year=2019',
+        'year=2019&month=10',
+        'year=2019&month=10&day=1',
+    ])
+    def test_list_filters_use_index(
+            self,
+            set_of_tasks_data,
+            explain,
+            params,
+    ):
+        user = set_of_tasks_data['task1'].user
+        queryset = filter_by_start_date(
+            Task.objects.filter(user=user), QueryDict(params)
+        )
+
+        plan = explain(queryset.order_by('start_date'))
+
+        assert 'api_task_user_start_date_idx' in plan
+        assert 'EXTRACT' not in plan.upper()
+
+    @pytest.mark.django_db
+    def test_statuses_window_uses_index(self, set_of_tasks_data, explain):
+        user = set_of_tasks_data['task1'].user
+        queryset = filter_by_date_window(
+            Task.objects.filter(user=user),
+            QueryDict('from=2019-08-01&to=2019-08-31'),
+        )
+
+        plan = explain(queryset.statuses())
+
+        assert 'api_task_user_start_date_idx' in plan
+
+    @pytest.mark.django_db
+    def test_changes_use_index(self, set_of_tasks_data, explain):
+        user = set_of_tasks_data['task1'].user
+        queryset = Task.objects.filter(user=user, version__gte=1)
+
+        plan = explain(queryset)
+
+        assert 'api_task_user_version_idx' in plan
+
+    @pytest.mark.django_db
+    def test_next_page_uses_index_without_sort(
+            self,
+            set_of_tasks_data,
+            explain,
+            rf,
+    ):
+        task = Task.objects.get(pk=set_of_tasks_data['task1'].pk)
+        paginator = TaskCursorPagination()
+        cursor = paginator.encode_cursor((task.start_date, task.pk))
+        request = Request(rf.get('/', {'cursor': cursor}))
+
+        with CaptureQueriesContext(connection) as queries:
+            paginator.paginate_queryset(
+                Task.objects.filter(user_id=task.user_id).values(
+                    *TaskValuesSerializer.fields
+                ),
+                request,
+            )
+        sql = queries.captured_queries[0]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE api_task')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            # Likewise, see whether the index gives the order at all.
+            cursor.execute('SET LOCAL enable_sort = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+
+        assert 'OFFSET' not in sql
+        assert 'api_task_user_start_date_idx' in plan
+        assert 'Sort' not in plan
+
 
 class TestUpdateTask:
 
@@ -1293,3 +1683,823 @@ class TestStatusesTask:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.data['detail'].code == 'not_authenticated'
+
+    @pytest.mark.django_db
+    def test_statuses_single_query(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+            django_assert_num_queries,
+    ):
+        url = reverse('task-statuses')
+
+        acc = set_of_authenticated_accounts_data['authenticated_account1']
+        auth_header = f'Bearer {acc["access-token"]}'
+
+        user = User.objects.get(username=acc['username'])
+        Task.objects.bulk_create(
+            Task(title='task', start_date=f'2019-10-0{i % 5 + 1}T14:15:22Z',
+                 end_date='2019-10-24T14:15:22Z', completed=i % 2 == 0,
+                 user=user)
+            for i in range(50)
+        )
+
+        # One query to authenticate the user, one for the rollup.
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_AUTHORIZATION=auth_header)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 5
+        assert all(
+            day['completed'] and day['not_completed'] for day in response.data
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params, dates', [
+        ({'year': 2019, 'month': 10}, ['2019-10-01', '2019-10-31']),
+        ({'year': 2019, 'month': 9}, ['2019-09-30']),
+        ({'from': '2019-10-01', 'to': '2019-10-31'},
+         ['2019-10-01', '2019-10-31']),
+        ({'from': '2019-10-31'}, ['2019-10-31', '2019-11-01']),
+        ({'to': '2019-09-30'}, ['2019-09-30']),
+    ])
+    def test_statuses_date_window(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+            params,
+            dates,
+    ):
+        url = reverse('task-statuses')
+
+        acc = set_of_authenticated_accounts_data['authenticated_account1']
+        auth_header = f'Bearer {acc["access-token"]}'
+
+        user = User.objects.get(username=acc['username'])
+        for day in ['2019-09-30', '2019-10-01', '2019-10-31', '2019-11-01']:
+            Task.objects.create(title='task', start_date=f'{day}T23:15:22Z',
+                                end_date='2019-12-24T14:15:22Z', user=user)
+
+        response = client.get(url, params, HTTP_AUTHORIZATION=auth_header)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [day['date'][:10] for day in response.data] == dates
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('params, field', [
+        ({'month': 10}, 'month'),
+        ({'year': 'abc'}, 'year'),
+        ({'year': 2019, 'month': 13}, 'month'),
+        ({'from': '2019-13-01'}, 'from'),
+        ({'from': '2019-10-02', 'to': '2019-10-01'}, 'to'),
+    ])
+    def test_statuses_invalid_date_window(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+            params,
+            field,
+    ):
+        url = reverse('task-statuses')
+
+        acc = set_of_authenticated_accounts_data['authenticated_account1']
+        auth_header = f'Bearer {acc["access-token"]}'
+
+        response = client.get(url, params, HTTP_AUTHORIZATION=auth_header)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert field in response.data
+
+
+class TestBulkCreateTask:
+
+    @pytest.mark.django_db
+    def test_bulk_create(
+            self,
+            client,
+            account,
+            django_assert_num_queries,
+    ):
+        url = reverse('task-bulk')
+        data = [
+            {
+                'title': f'task {i}',
+                'start_date': '2019-08-24T14:15:22Z',
+                'end_date': '2019-10-24T14:15:22Z',
+            }
+            for i in range(3)
+        ]
+
+        # User lookup, savepoint, INSERT, savepoint release.
+        with django_assert_num_queries(4):
+            response = client.post(
+                url,
+                data=data,
+                HTTP_AUTHORIZATION=account['auth_header'],
+                content_type='application/json',
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 3
+
+        user = User.objects.get(username=account['username'])
+        tasks = Task.objects.filter(user=user).order_by('id')
+        assert [task.title for task in tasks] == ['task 0', 'task 1', 'task 2']
+        assert [task['id'] for task in response.data] == [
+            task.id for task in tasks
+        ]
+        assert all(task['user'] == user.id for task in response.data)
+
+    @pytest.mark.django_db
+    def test_bulk_create_with_invalid_items(self, client, account):
+        url = reverse('task-bulk')
+        data = [
+            {
+                'title': 'task',
+                'start_date': '2019-08-24T14:15:22Z',
+                'end_date': '2019-10-24T14:15:22Z',
+            },
+            {
+                'start_date': '2019-08-24T14:15:22Z',
+                'end_date': '2019-10-24T14:15:22Z',
+            },
+            {
+                'title': 'task',
+                'start_date': '2019-10-24T14:15:22Z',
+                'end_date': '2019-08-24T14:15:22Z',
+            },
+        ]
+
+        response = client.post(
+            url,
+            data=data,
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == [
+            {},
+            {'title': 'This field is required.'},
+            {'date': 'End date must be greater than start date.'},
+        ]
+        assert Task.objects.count() == 0
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('data, message', [
+        ({'title': 'task'}, 'Expected a list of items but got type "dict".'),
+        ([], 'This list may not be empty.'),
+        ([{}] * 3, 'Ensure this list has no more than 2 items.'),
+    ])
+    def test_bulk_create_with_invalid_body(
+            self,
+            client,
+            account,
+            settings,
+            data,
+            message,
+    ):
+        settings.TASKS_MAX_BULK_SIZE = 2
+
+        response = client.post(
+            reverse('task-bulk'),
+            data=data,
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'non_field_errors': message}
+
+    @pytest.mark.django_db
+    def test_bulk_create_by_unauthorized_user(self, client):
+        response = client.post(
+            reverse('task-bulk'),
+            data=[],
+            content_type='application/json',
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestBulkUpdateTask:
+
+    @pytest.mark.django_db
+    def test_bulk_patch(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+            django_assert_num_queries,
+    ):
+        task1 = set_of_tasks_data['task1']
+        task2 = set_of_tasks_data['task2']
+        data = [
+            {'id': task2.id, 'completed': True},
+            {'id': task1.id, 'title': 'new', 'end_date': '2020-01-01T00:00Z'},
+        ]
+
+        # User lookup, SELECT, savepoint, UPDATE, savepoint release.
+        with django_assert_num_queries(5):
+            response = client.patch(
+                reverse('task-bulk'),
+                data=data,
+                HTTP_AUTHORIZATION=account['auth_header'],
+                content_type='application/json',
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.data] == [task2.id, task1.id]
+
+        task1.refresh_from_db()
+        task2.refresh_from_db()
+        assert task1.title == 'new'
+        assert task1.end_date.year == 2020
+        assert not task1.completed
+        assert task2.title == 'task2'
+        assert task2.completed
+
+    @pytest.mark.django_db
+    def test_bulk_patch_with_invalid_items(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+    ):
+        task1 = set_of_tasks_data['task1']
+        data = [
+            {'id': task1.id, 'title': 'new'},
+            {'id': set_of_tasks_data['task3'].id, 'completed': True},
+            {'title': 'new'},
+            {'id': task1.id, 'start_date': '2020-01-01T00:00Z'},
+        ]
+
+        response = client.patch(
+            reverse('task-bulk'),
+            data=data,
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == [
+            {},
+            {'id': 'Not found.'},
+            {'id': 'This field is required.'},
+            {'id': 'Duplicate id.'},
+        ]
+        task1.refresh_from_db()
+        assert task1.title == 'task1'
+
+    @pytest.mark.django_db
+    def test_bulk_patch_checks_dates_of_each_task(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+    ):
+        task1 = set_of_tasks_data['task1']
+
+        response = client.patch(
+            reverse('task-bulk'),
+            data=[{'id': task1.id, 'start_date': '2020-01-01T00:00Z'}],
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == [
+            {'date': 'End date must be greater than start date.'},
+        ]
+
+    @pytest.mark.django_db
+    def test_bulk_delete(self, client, account, set_of_tasks_data):
+        task1 = set_of_tasks_data['task1']
+        task3 = set_of_tasks_data['task3']
+
+        response = client.delete(
+            reverse('task-bulk') + f'?ids={task1.id},{task3.id},0',
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            'deleted': [task1.id],
+            'not_found': [task3.id, 0],
+        }
+        assert not Task.objects.filter(id=task1.id).exists()
+        assert Task.objects.filter(id=task3.id).exists()
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('query, message', [
+        ('', 'This field is required.'),
+        ('?ids=1,a', 'A valid integer is required.'),
+    ])
+    def test_bulk_delete_with_invalid_ids(
+            self,
+            client,
+            account,
+            query,
+            message,
+    ):
+        response = client.delete(
+            reverse('task-bulk') + query,
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'ids': message}
+
+    @pytest.mark.django_db
+    def test_complete_tasks_on_date(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+            django_assert_num_queries,
+    ):
+        user = set_of_tasks_data['task1'].user
+        other_day = Task.objects.create(
+            title='task', start_date='2019-08-25T00:00:00Z',
+            end_date='2019-10-24T14:15:22Z', user=user,
+        )
+
+        # User lookup and a single UPDATE.
+        with django_assert_num_queries(2):
+            response = client.post(
+                reverse('task-complete'),
+                data={'date': '2019-08-24'},
+                HTTP_AUTHORIZATION=account['auth_header'],
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'updated': 2}
+        assert Task.objects.filter(user=user, completed=True).count() == 2
+        other_day.refresh_from_db()
+        assert not other_day.completed
+        assert not Task.objects.filter(
+            id=set_of_tasks_data['task3'].id, completed=True
+        ).exists()
+
+    @pytest.mark.django_db
+    def test_complete_tasks_on_last_date(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+    ):
+        user = set_of_tasks_data['task1'].user
+        last_day = Task.objects.create(
+            title='task', start_date='9999-12-31T10:00:00Z',
+            end_date='9999-12-31T11:00:00Z', user=user,
+        )
+
+        response = client.post(
+            reverse('task-complete'),
+            data={'date': '9999-12-31'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'updated': 1}
+        last_day.refresh_from_db()
+        assert last_day.completed
+
+
+class TestTaskCache:
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('name', ['task-list', 'task-statuses'])
+    def test_cached_response(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+            django_assert_num_queries,
+            name,
+    ):
+        url = reverse(name)
+        expected = client.get(url, HTTP_AUTHORIZATION=account['auth_header'])
+
+        # The user is known active from the first request.
+        with django_assert_num_queries(0):
+            response = client.get(
+                url, HTTP_AUTHORIZATION=account['auth_header']
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+    @pytest.mark.django_db
+    def test_cache_per_user_and_query(
+            self,
+            client,
+            set_of_authenticated_accounts_data,
+            set_of_tasks_data,
+    ):
+        url = reverse('task-list')
+        for name, title in [('authenticated_account1', 'task1'),
+                            ('authenticated_account2', 'task3')]:
+            acc = set_of_authenticated_accounts_data[name]
+            response = client.get(
+                url, HTTP_AUTHORIZATION=f'Bearer {acc["access-token"]}'
+            )
+            assert response.data[0]['title'] == title
+
+            response = client.get(
+                url,
+                {'year': 2020},
+                HTTP_AUTHORIZATION=f'Bearer {acc["access-token"]}',
+            )
+            assert response.data == []
+
+    @pytest.mark.django_db
+    def test_invalidated_by_api_writes(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+    ):
+        url = reverse('task-list')
+        task1 = set_of_tasks_data['task1']
+
+        def titles():
+            response = client.get(
+                url, HTTP_AUTHORIZATION=account['auth_header']
+            )
+            return sorted(task['title'] for task in response.data)
+
+        assert titles() == ['task1', 'task2']
+
+        # Writes bypassing the API are not seen until the cache expires.
+        Task.objects.filter(id=task1.id).update(title='stale')
+        assert titles() == ['task1', 'task2']
+
+        client.patch(
+            reverse('task-detail', args=[task1.id]),
+            data={'title': 'new'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+        assert titles() == ['new', 'task2']
+
+        client.post(
+            reverse('task-bulk'),
+            data=[{'title': 'bulk', 'start_date': '2019-08-24T14:15:22Z',
+                   'end_date': '2019-10-24T14:15:22Z'}],
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+        assert titles() == ['bulk', 'new', 'task2']
+
+        client.delete(
+            reverse('task-detail', args=[task1.id]),
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+        assert titles() == ['bulk', 'task2']
+
+    @pytest.mark.django_db
+    def test_statuses_invalidated_by_complete(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+    ):
+        url = reverse('task-statuses')
+        response = client.get(url, HTTP_AUTHORIZATION=account['auth_header'])
+        assert response.data[0]['completed'] is False
+
+        client.post(
+            reverse('task-complete'),
+            data={'date': '2019-08-24'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+
+        response = client.get(url, HTTP_AUTHORIZATION=account['auth_header'])
+        assert response.data[0]['completed'] is True
+
+
+class TestConditionalTask:
+
+    @pytest.fixture
+    def urls(self, set_of_tasks_data):
+        return [
+            reverse('task-list'),
+            reverse('task-statuses'),
+            reverse('task-detail', args=[set_of_tasks_data['task1'].id]),
+        ]
+
+    @pytest.mark.django_db
+    def test_not_modified(
+            self,
+            client,
+            account,
+            urls,
+            django_assert_num_queries,
+    ):
+        for url in urls:
+            response = client.get(
+                url, HTTP_AUTHORIZATION=account['auth_header']
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response['Cache-Control'] == 'private, no-cache'
+            etag = response['ETag']
+
+            # The user is known active from the first request.
+            with django_assert_num_queries(0):
+                response = client.get(
+                    url,
+                    HTTP_AUTHORIZATION=account['auth_header'],
+                    HTTP_IF_NONE_MATCH=etag,
+                )
+
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.content == b''
+            assert response['ETag'] == etag
+
+            response = client.get(
+                url,
+                HTTP_AUTHORIZATION=account['auth_header'],
+                HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+            )
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.django_db
+    def test_etag_per_representation(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+            urls,
+    ):
+        task2 = reverse('task-detail', args=[set_of_tasks_data['task2'].id])
+        requests = [
+            (urls[0], {}, {}),
+            (urls[0], {'year': 2019}, {}),
+            (urls[0], {}, {'HTTP_ACCEPT': 'application/x-ndjson'}),
+            (urls[1], {}, {}),
+            (urls[2], {}, {}),
+            (task2, {}, {}),
+        ]
+
+        etags = {
+            client.get(
+                url, params, HTTP_AUTHORIZATION=account['auth_header'],
+                **headers,
+            )['ETag']
+            for url, params, headers in requests
+        }
+
+        assert len(etags) == len(requests)
+
+    @pytest.mark.django_db
+    def test_modified_after_write(
+            self,
+            client,
+            account,
+            set_of_tasks_data,
+            urls,
+    ):
+        etags = [
+            client.get(url, HTTP_AUTHORIZATION=account['auth_header'])['ETag']
+            for url in urls
+        ]
+
+        client.patch(
+            reverse('task-detail', args=[set_of_tasks_data['task2'].id]),
+            data={'completed': True},
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+
+        for url, etag in zip(urls, etags):
+            response = client.get(
+                url,
+                HTTP_AUTHORIZATION=account['auth_header'],
+                HTTP_IF_NONE_MATCH=etag,
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] != etag
+
+    @pytest.mark.django_db
+    def test_modified_after_admin_delete(
+            self,
+            client,
+            admin_client,
+            account,
+            set_of_tasks_data,
+    ):
+        url = reverse('task-list')
+        response = client.get(url, HTTP_AUTHORIZATION=account['auth_header'])
+        etag = response['ETag']
+
+        task1 = set_of_tasks_data['task1']
+        admin_client.post(
+            reverse('admin:api_task_delete', args=[task1.id]), {'post': 'yes'}
+        )
+
+        response = client.get(
+            url,
+            HTTP_AUTHORIZATION=account['auth_header'],
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.data] == [
+            set_of_tasks_data['task2'].id
+        ]
+
+
+class TestTaskChanges:
+
+    @pytest.fixture
+    def get_changes(self, client, account):
+        def get_changes(since=None):
+            params = {} if since is None else {'since': since}
+            return client.get(
+                reverse('task-changes'),
+                params,
+                HTTP_AUTHORIZATION=account['auth_header'],
+            )
+
+        return get_changes
+
+    @pytest.mark.django_db
+    def test_changes_without_token(
+            self,
+            get_changes,
+            set_of_tasks_data,
+            django_assert_num_queries,
+    ):
+        # User lookup, snapshot and tasks.
+        with django_assert_num_queries(3):
+            response = get_changes()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.data['changed']] == [
+            set_of_tasks_data['task1'].id, set_of_tasks_data['task2'].id,
+        ]
+        assert response.data['changed'][0] == TaskSerializer(
+            set_of_tasks_data['task1']
+        ).data
+        assert response.data['deleted'] == []
+        assert response.data['next']
+
+    # Versions are transaction ids: the writes have to commit.
+    @pytest.mark.django_db(transaction=True)
+    def test_changes_since_token(
+            self,
+            client,
+            account,
+            get_changes,
+            set_of_tasks_data,
+            django_assert_num_queries,
+    ):
+        task1 = set_of_tasks_data['task1']
+        task2 = set_of_tasks_data['task2']
+        token = get_changes().data['next']
+
+        response = get_changes(token)
+        assert response.data['changed'] == []
+        assert response.data['deleted'] == []
+
+        client.patch(
+            reverse('task-detail', args=[task2.id]),
+            data={'title': 'new'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+        client.delete(
+            reverse('task-detail', args=[task1.id]),
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+        created = Task.objects.create(
+            title='task', start_date='2019-08-25T00:00:00Z',
+            end_date='2019-10-24T14:15:22Z', user=task1.user,
+        )
+
+        # Snapshot, tasks and tombstones, the user is known active by now.
+        with django_assert_num_queries(3):
+            response = get_changes(token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task['id'] for task in response.data['changed']] == [
+            task2.id, created.id,
+        ]
+        assert response.data['changed'][0]['title'] == 'new'
+        assert response.data['deleted'] == [task1.id]
+
+        token = response.data['next']
+        client.post(
+            reverse('task-complete'),
+            data={'date': '2019-08-25'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+        client.patch(
+            reverse('task-bulk'),
+            data=[{'id': task2.id, 'completed': True}],
+            HTTP_AUTHORIZATION=account['auth_header'],
+            content_type='application/json',
+        )
+        client.delete(
+            reverse('task-bulk'),
+            {'ids': f'{set_of_tasks_data["task3"].id}'},
+            HTTP_AUTHORIZATION=account['auth_header'],
+        )
+
+        response = get_changes(token)
+        assert [task['id'] for task in response.data['changed']] == [
+            created.id, task2.id,
+        ]
+        assert all(task['completed'] for task in response.data['changed'])
+        assert response.data['deleted'] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_late_commit_not_missed(self, get_changes, set_of_tasks_data):
+        """A write committed after a sync is in the next one."""
+        task = set_of_tasks_data['task1']
+        other = connection.copy()
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE api_task SET title = %s, '
+                    'version = txid_current() WHERE id = %s',
+                    ['late', task.id],
+                )
+            # A later write, committed first.
+            Task.objects.create(
+                title='quick', start_date='2019-08-25T00:00:00Z',
+                end_date='2019-10-24T14:15:22Z', user=task.user,
+            )
+            token = get_changes().data['next']
+            other.commit()
+        finally:
+            other.close()
+
+        response = get_changes(token)
+
+        assert [task['title'] for task in response.data['changed']] == [
+            'late', 'quick',
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('since', ['', 'abc', encode_token(
+        1, timezone.now().replace(tzinfo=None)
+    ), urlsafe_b64encode(timezone.now().isoformat().encode()).decode()])
+    def test_invalid_token(self, get_changes, set_of_tasks_data, since):
+        response = get_changes(since)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {'since': 'Invalid token.'}
+
+    @pytest.mark.django_db
+    def test_expired_token(self, get_changes, set_of_tasks_data, settings):
+        since = timezone.now() - timedelta(
+            days=settings.TASKS_SYNC_RETENTION, seconds=1
+        )
+
+        response = get_changes(encode_token(1, since))
+
+        assert response.status_code == status.HTTP_410_GONE
+
+    @pytest.mark.django_db
+    def test_admin_delete_leaves_tombstones(
+            self,
+            admin_client,
+            set_of_tasks_data,
+    ):
+        task1 = set_of_tasks_data['task1']
+        task3 = set_of_tasks_data['task3']
+
+        admin_client.post(reverse('admin:api_task_changelist'), {
+            'action': 'delete_selected',
+            '_selected_action': [task1.id, task3.id],
+            'post': 'yes',
+        })
+
+        assert sorted(
+            TaskTombstone.objects.values_list('user_id', 'task_id')
+        ) == sorted([
+            (task1.user_id, task1.id), (task3.user_id, task3.id),
+        ])
+
+    @pytest.mark.django_db
+    def test_prune_tombstones(self, set_of_tasks_data, settings):
+        user = set_of_tasks_data['task1'].user
+        old, new = TaskTombstone.objects.bulk_create([
+            TaskTombstone(user=user, task_id=1),
+            TaskTombstone(user=user, task_id=2),
+        ])
+        TaskTombstone.objects.filter(id=old.id).update(
+            deleted_at=timezone.now() - timedelta(
+                days=settings.TASKS_SYNC_RETENTION, seconds=1
+            ),
+        )
+
+        out = StringIO()
+        call_command('prune_task_tombstones', stdout=out)
+
+        assert out.getvalue() == 'Deleted 1 tombstones.\n'
+        assert list(TaskTombstone.objects.values_list('id', flat=True)) == [
+            new.id
+        ]
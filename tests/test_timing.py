@@ -0,0 +1,141 @@
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.middleware import RequestTimingMiddleware
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    """Time the task views querying the database."""
+    settings.TASKS_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def sampled(settings):
+    settings.REQUEST_TIMING_SAMPLE_RATE = 1
+
+
+def parse_server_timing(response):
+    """Return {metric: (duration, description)} of Server-Timing."""
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        params = dict(param.split('=', 1) for param in params)
+        metrics[name] = float(params['dur']), params.get('desc')
+    return metrics
+
+
+def test_disabled(settings):
+    settings.REQUEST_TIMING_SAMPLE_RATE = 0
+    settings.REQUEST_TIMING_SLOW_MS = 0
+
+    with pytest.raises(MiddlewareNotUsed):
+        RequestTimingMiddleware(lambda request: None)
+
+
+@pytest.mark.django_db
+def test_not_sampled(auth_header):
+    response = Client().get(
+        reverse('task-list'), HTTP_AUTHORIZATION=auth_header
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_server_timing(auth_header, sampled):
+    client = Client()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            reverse('task-list'), HTTP_AUTHORIZATION=auth_header
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    metrics = parse_server_timing(response)
+    assert list(metrics) == ['db', 'serialize', 'render', 'total']
+    assert metrics['db'][1] == f'"{len(queries)} queries"'
+    assert all(duration >= 0 for duration, _ in metrics.values())
+    assert metrics['total'][0] >= sum(
+        metrics[name][0] for name in ('db', 'serialize', 'render')
+    )
+
+
+@pytest.mark.django_db
+def test_server_timing_of_write(auth_header, sampled):
+    response = Client().post(
+        reverse('task-list'),
+        {
+            'title': 'task',
+            'start_date': '2022-03-15T00:00:00Z',
+            'end_date': '2022-03-16T00:00:00Z',
+        },
+        content_type='application/json',
+        HTTP_AUTHORIZATION=auth_header,
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    metrics = parse_server_timing(response)
+    assert re.fullmatch(r'"[1-9]\d* queries"', metrics['db'][1])
+    assert 'serialize' in metrics and 'render' in metrics
+
+
+@pytest.mark.django_db
+def test_server_timing_async(auth_header, sampled):
+    response = async_to_sync(AsyncClient().get)(
+        reverse('async-task-list'), authorization=auth_header
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    metrics = parse_server_timing(response)
+    assert re.fullmatch(r'"[1-9]\d* queries"', metrics['db'][1])
+    assert 'serialize' in metrics and 'render' in metrics
+
+
+@pytest.mark.django_db
+def test_slow_request_logged(auth_header, sampled, settings, caplog):
+    settings.REQUEST_TIMING_SLOW_MS = 0.001
+
+    with caplog.at_level(logging.WARNING, logger='api.middleware'):
+        Client().get(reverse('task-list'), HTTP_AUTHORIZATION=auth_header)
+
+    [record] = caplog.records
+    assert record.getMessage().startswith(
+        'Slow request method=GET path=/api/v1/tasks/ view=task-list '
+        'status=200 total_ms='
+    )
+    assert record.timing['queries'] > 0
+    assert {'db_ms', 'serialize_ms', 'render_ms'} <= set(record.timing)
+
+
+@pytest.mark.django_db
+def test_slow_request_logged_without_sampling(auth_header, settings, caplog):
+    settings.REQUEST_TIMING_SLOW_MS = 0.001
+
+    with caplog.at_level(logging.WARNING, logger='api.middleware'):
+        response = Client().get(
+            reverse('task-list'), HTTP_AUTHORIZATION=auth_header
+        )
+
+    assert 'Server-Timing' not in response
+    [record] = caplog.records
+    assert set(record.timing) == {
+        'method', 'path', 'view', 'status', 'total_ms',
+    }
+
+
+@pytest.mark.django_db
+def test_fast_request_not_logged(auth_header, caplog):
+    with caplog.at_level(logging.WARNING, logger='api.middleware'):
+        Client().get(reverse('task-list'), HTTP_AUTHORIZATION=auth_header)
+
+    assert not caplog.records
@@ -1,7 +1,21 @@
+import os
+import subprocess
+import sys
+import time
+
 import pytest
 
+from django.conf import settings
 from django.urls import reverse
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.tokens import (
+    get_verified_token,
+    is_blacklist_enabled,
+    verified_tokens,
+)
 
 
 @pytest.mark.django_db
@@ -46,3 +60,174 @@ def test_verify_blank_token(client):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.data['token'] is not None
+
+
+@pytest.fixture
+def access_token(client, set_of_accounts_data):
+    url = reverse('token_obtain_pair')
+    data = {
+        'username': set_of_accounts_data['account1']['username'],
+        'password': set_of_accounts_data['account1']['password'],
+    }
+    return client.post(url, data=data).data['access']
+
+
+@pytest.mark.django_db
+def test_verify_token_is_cached(client, access_token):
+    url = reverse('token_verify')
+    for _ in range(3):
+        response = client.post(url, data={'token': access_token})
+        assert response.status_code == status.HTTP_200_OK
+
+    assert verified_tokens.stats() == {
+        'size': 1,
+        'max_size': 10000,
+        'hits': 2,
+        'misses': 1,
+    }
+
+
+@pytest.mark.django_db
+def test_verify_tampered_token_after_cached(client, access_token):
+    url = reverse('token_verify')
+    client.post(url, data={'token': access_token})
+
+    header, payload, signature = access_token.split('.')
+    signature = ('A' if signature[0] != 'A' else 'B') + signature[1:]
+    response = client.post(
+        url, data={'token': f'{header}.{payload}.{signature}'}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.data['code'] == 'token_not_valid'
+
+
+@pytest.mark.django_db
+def test_cached_token_expires(client, access_token, monkeypatch):
+    url = reverse('token_verify')
+    client.post(url, data={'token': access_token})
+
+    now = time.time() + 15 * 60 + 1
+    monkeypatch.setattr('api.tokens.time.time', lambda: now)
+    client.post(url, data={'token': access_token})
+
+    assert verified_tokens.stats()['hits'] == 0
+    assert verified_tokens.stats()['misses'] == 2
+
+
+@pytest.mark.django_db
+def test_token_cache_is_bounded(
+        client,
+        set_of_authenticated_accounts_data,
+        settings,
+):
+    settings.JWT_TOKEN_CACHE_SIZE = 1
+    url = reverse('token_verify')
+    token1 = set_of_authenticated_accounts_data['authenticated_account1']
+    token2 = set_of_authenticated_accounts_data['authenticated_account2']
+
+    for token in [token1, token2, token1]:
+        client.post(url, data={'token': token['access-token']})
+
+    assert verified_tokens.stats()['size'] == 1
+    assert verified_tokens.stats()['misses'] == 3
+
+
+@pytest.mark.django_db
+def test_bearer_token_is_cached(client, access_token):
+    for _ in range(3):
+        response = client.get(
+            reverse('task-list'), HTTP_AUTHORIZATION=f'Bearer {access_token}'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    assert verified_tokens.stats()['hits'] == 2
+
+
+@pytest.mark.django_db
+def test_token_cache_stats(client, access_token, admin_user):
+    url = reverse('token_cache_stats')
+    response = client.get(url, HTTP_AUTHORIZATION=f'Bearer {access_token}')
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post(reverse('token_obtain_pair'), data={
+        'username': admin_user.username,
+        'password': 'password',
+    })
+    admin_header = f'Bearer {response.data["access"]}'
+    response = client.get(url, HTTP_AUTHORIZATION=admin_header)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {
+        'size': 2,
+        'max_size': 10000,
+        'hits': 0,
+        'misses': 2,
+    }
+
+
+def test_token_blacklist():
+    """Run the blacklisted tests with the token blacklist installed."""
+    tests_dir = os.path.dirname(__file__)
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join(
+            filter(None, [tests_dir, os.environ.get('PYTHONPATH')])
+        ),
+    }
+
+    result = subprocess.run(
+        [
+            sys.executable, '-m', 'pytest', __file__, '-k', 'blacklisted',
+            '--ds', 'blacklist_settings', '--create-db',
+            '-p', 'no:cacheprovider', '-q',
+        ],
+        env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+
+    assert result.returncode == 0, result.stdout
+    assert '2 passed' in result.stdout
+
+
+blacklist_installed = pytest.mark.skipif(
+    not is_blacklist_enabled(), reason='run by test_token_blacklist',
+)
+
+
+@pytest.fixture
+def refresh_token(client, set_of_accounts_data):
+    url = reverse('token_obtain_pair')
+    data = {
+        'username': set_of_accounts_data['account1']['username'],
+        'password': set_of_accounts_data['account1']['password'],
+    }
+    return client.post(url, data=data).data['refresh']
+
+
+@blacklist_installed
+@pytest.mark.django_db
+def test_verify_blacklisted_token_after_cached(client, refresh_token):
+    url = reverse('token_verify')
+    response = client.post(url, data={'token': refresh_token})
+    assert response.status_code == status.HTTP_200_OK
+
+    RefreshToken(refresh_token).blacklist()
+    response = client.post(url, data={'token': refresh_token})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert verified_tokens.stats()['hits'] == 1
+
+
+@blacklist_installed
+@pytest.mark.django_db
+def test_blacklisted_token_rejected_on_cache_hit(refresh_token):
+    get_verified_token(RefreshToken, refresh_token).blacklist()
+
+    with pytest.raises(TokenError):
+        get_verified_token(RefreshToken, refresh_token)
+    assert verified_tokens.stats() == {
+        'size': 1,
+        'max_size': 10000,
+        'hits': 1,
+        'misses': 1,
+    }